@@ -1,13 +1,23 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
+from sqlalchemy.exc import OperationalError
 from config import Config
-from models import db, Inventory, Transaction, Category
+from models import (
+    db, Inventory, Transaction, Category, DailySales,
+    add_missing_columns, bump_table_versions_on_commit, create_missing_indexes, get_table_versions,
+    install_sqlite_pragmas, record_daily_sales, retry_on_lock,
+)
 from auth import auth
-from datetime import datetime, date
-import joblib
-import os
-import pandas as pd
+from forecast import forecast, loaded_model_registry, warmup, start_warmup
+from search import install_inventory_search
+from cache import derived_cache
+from events import EventBus
+import metrics
+from datetime import datetime, date, timedelta
+import base64
+import hashlib
+import json
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -18,7 +28,7 @@ CORS(
     app,
     origins=[o.strip() for o in cors_origins.split(",")],
     supports_credentials=True,
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", "Last-Event-ID"],
     methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
 )
 
@@ -28,6 +38,16 @@ jwt = JWTManager(app)
 # Register auth blueprint under /api/auth
 app.register_blueprint(auth, url_prefix="/api/auth")
 
+# Forecasting routes; models and pandas load on the first forecast request
+app.register_blueprint(forecast)
+
+# Change feed for GET /api/events; write routes publish after they commit
+events = EventBus(
+    replay_size=app.config["EVENTS_REPLAY_SIZE"],
+    queue_size=app.config["EVENTS_QUEUE_SIZE"],
+    max_clients=app.config["EVENTS_MAX_CLIENTS"],
+)
+
 
 # ----------------------------------------------------------------
 # Centralized error handlers
@@ -42,6 +62,52 @@ def server_error(e):
     return jsonify({"error": "Internal server error"}), 500
 
 
+# ----------------------------------------------------------------
+# Pagination and conditional GET helpers
+# ----------------------------------------------------------------
+def encode_cursor(*values):
+    """Opaque, URL-safe page cursor carrying ``values``."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """The values given to ``encode_cursor``. Raises ValueError if malformed."""
+    values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if not isinstance(values, list):
+        raise ValueError("invalid cursor")
+    return values
+
+
+def cursor_int(value):
+    """A non-negative integer cursor part (offset, id or segment); raises ValueError otherwise."""
+    if type(value) is not int or value < 0:
+        raise ValueError("invalid cursor")
+    return value
+
+
+def table_etag(*tables):
+    """Strong ETag for a response built only from ``tables`` for this URL.
+
+    Every write bumps the tables' counters (models.TableVersion), so the tag
+    changes exactly when the rows behind the response may have changed, and
+    checking it costs one small query instead of reading the rows.
+    """
+    versions = get_table_versions()
+    url = hashlib.sha1(request.full_path.encode()).hexdigest()[:16]
+    return "-".join([*(f"{t}.{versions.get(t, 0)}" for t in tables), url])
+
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    # Let clients keep the body but revalidate on every poll
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag):
+    return with_etag(Response(status=304), etag)
+
+
 # ================================================================
 # CATEGORIES
 # ================================================================
@@ -75,12 +141,14 @@ def create_category():
             existing.description = description
             existing.status = status
             db.session.commit()
+            events.publish("category.upsert", existing.to_dict())
             return jsonify(existing.to_dict()), 200
         return jsonify({"error": "Category with this name already exists"}), 409
 
     category = Category(name=name, description=description, status=status)
     db.session.add(category)
     db.session.commit()
+    events.publish("category.upsert", category.to_dict())
     return jsonify(category.to_dict()), 201
 
 
@@ -109,6 +177,7 @@ def update_category(category_id):
         category.status = data["status"]
 
     db.session.commit()
+    events.publish("category.upsert", category.to_dict())
     return jsonify(category.to_dict()), 200
 
 
@@ -121,6 +190,7 @@ def delete_category(category_id):
 
     category.status = "deleted"
     db.session.commit()
+    events.publish("category.delete", {"id": str(category.id)})
     return jsonify({"message": "Category deleted"}), 200
 
 
@@ -129,6 +199,10 @@ def delete_category(category_id):
 # ================================================================
 @app.route("/api/inventory", methods=["GET"])
 def get_inventory():
+    etag = table_etag("inventory")
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+
     query = Inventory.query
 
     include_deleted = request.args.get("includeDeleted", "false").lower() == "true"
@@ -137,14 +211,8 @@ def get_inventory():
 
     search = request.args.get("search", "").strip()
     if search:
-        like = f"%{search}%"
-        query = query.filter(
-            db.or_(
-                Inventory.name.ilike(like),
-                Inventory.category.ilike(like),
-                Inventory.description.ilike(like),
-            )
-        )
+        # Full-text match, best hits first (see search.py)
+        query = inventory_search.apply(query, search)
 
     category = request.args.get("category", "").strip()
     if category:
@@ -184,8 +252,63 @@ def get_inventory():
         except ValueError:
             pass
 
-    items = query.order_by(Inventory.id.desc()).all()
-    return jsonify([i.to_dict() for i in items]), 200
+    return inventory_listing(query, Inventory.FIELDS, etag, newest_first=True, ranked=bool(search))
+
+
+def inventory_listing(query, formatters, etag, *, newest_first, ranked=False):
+    """Serialize an inventory query, honouring ``fields``, ``limit`` and ``cursor``.
+
+    ``formatters`` is the row shape (``Inventory.FIELDS`` or a legacy
+    one), serialized by ``Inventory.project``; ``fields=`` picks a subset
+    and only those columns are SELECTed. Without ``limit``/``cursor`` the result is a plain array as
+    before; otherwise ``{"items", "nextCursor"}``. Pages are keyed on id,
+    except search results (``ranked``), which keep relevance order and page
+    by offset.
+    """
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()] or list(formatters)
+    unknown = [f for f in fields if f not in formatters]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}. Use: {', '.join(formatters)}"}), 400
+
+    cursor = request.args.get("cursor")
+    try:
+        limit = request.args.get("limit")
+        limit = int(limit) if limit not in (None, "") else None
+        kind, position = decode_cursor(cursor) if cursor else (None, None)
+        if cursor and kind != ("offset" if ranked else "id"):
+            raise ValueError("cursor does not belong to this listing")
+        position = cursor_int(position) if cursor else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid cursor or limit"}), 400
+    max_limit = app.config["INVENTORY_MAX_PAGE_SIZE"]
+    if limit is not None and not 1 <= limit <= max_limit:
+        return jsonify({"error": f"limit must be between 1 and {max_limit}"}), 400
+
+    columns = [getattr(Inventory, f) for f in dict.fromkeys(["id", *fields])]
+    query = query.with_entities(*columns).order_by(Inventory.id.desc() if newest_first else Inventory.id)
+
+    if limit is None and cursor is None:
+        rows = query.all()
+        return with_etag(jsonify([Inventory.project(r, fields, formatters) for r in rows]), etag), 200
+
+    if limit is None:
+        limit = app.config["INVENTORY_PAGE_SIZE"]
+    offset = 0
+    if ranked:
+        offset = position or 0
+        query = query.offset(offset)
+    elif position is not None:
+        query = query.filter(Inventory.id < position if newest_first else Inventory.id > position)
+    rows = query.limit(limit + 1).all()
+    items, more = rows[:limit], len(rows) > limit
+    next_cursor = None
+    if more:
+        next_cursor = encode_cursor("offset", offset + limit) if ranked else encode_cursor("id", items[-1].id)
+    body = {
+        "items": [Inventory.project(r, fields, formatters) for r in items],
+        "nextCursor": next_cursor,
+    }
+    return with_etag(jsonify(body), etag), 200
 
 
 @app.route("/api/inventory", methods=["POST"])
@@ -243,6 +366,7 @@ def add_inventory():
         msg = "Inventory created successfully"
 
     db.session.commit()
+    events.publish("inventory.upsert", inventory.to_dict())
     return jsonify({"message": msg, "item": inventory.to_dict()}), 201
 
 
@@ -277,6 +401,7 @@ def update_inventory(item_id):
         inventory.status = data["status"]
 
     db.session.commit()
+    events.publish("inventory.upsert", inventory.to_dict())
     return jsonify({"message": "Inventory updated", "item": inventory.to_dict()}), 200
 
 
@@ -289,6 +414,7 @@ def delete_inventory(item_id):
 
     inventory.status = "deleted"
     db.session.commit()
+    events.publish("inventory.delete", {"id": str(inventory.id)})
     return jsonify({"message": "Item deleted"}), 200
 
 
@@ -326,29 +452,62 @@ def create_transaction():
     if transaction_type == "sale":
         if inventory.expiry and inventory.expiry < date.today():
             return jsonify({"error": "Item is expired and cannot be sold"}), 400
-        if inventory.quantity < quantity:
-            return jsonify(
-                {"error": f"Insufficient stock. Available: {inventory.quantity}"}
-            ), 400
-        inventory.quantity -= quantity
         total_price = round(quantity * inventory.price, 2)
     elif transaction_type == "purchase":
-        inventory.quantity += quantity
         total_price = round(-(quantity * inventory.price), 2)
     else:
         return jsonify({"error": "Invalid transaction type. Use 'sale' or 'purchase'"}), 400
+    product_id, product_name = inventory.id, inventory.name
+
+    def apply():
+        # Stock no longer matches the last import, so clear its fingerprint
+        stock = (
+            db.update(Inventory)
+            .where(Inventory.id == product_id)
+            .values(content_hash=None)
+            .execution_options(synchronize_session=False)
+        )
+        if transaction_type == "sale":
+            # Conditional UPDATE: the stock check and decrement happen in one
+            # statement, so concurrent tills cannot both sell the last unit
+            result = db.session.execute(
+                stock.where(Inventory.quantity >= quantity).values(quantity=Inventory.quantity - quantity)
+            )
+            if result.rowcount == 0:
+                db.session.rollback()
+                return None
+        else:
+            db.session.execute(stock.values(quantity=Inventory.quantity + quantity))
+        bump_table_versions_on_commit(db.session, {"inventory"})
+        # Read inside the write transaction: exactly the stock this commit leaves
+        remaining = db.session.scalar(db.select(Inventory.quantity).where(Inventory.id == product_id))
+
+        row = {
+            "product_id": product_id,
+            "product_name": product_name,
+            "transaction_type": transaction_type,
+            "product_quantity": quantity,
+            "total_price": total_price,
+            "time_of_transaction": datetime.utcnow(),
+        }
+        transaction = Transaction(**row)
+        db.session.add(transaction)
+        record_daily_sales(db.session, [row])
+        db.session.commit()
+        return transaction, remaining
 
-    transaction = Transaction(
-        product_id=inventory.id,
-        product_name=inventory.name,
-        transaction_type=transaction_type,
-        product_quantity=quantity,
-        total_price=total_price,
-        time_of_transaction=datetime.utcnow(),
-    )
-
-    db.session.add(transaction)
-    db.session.commit()
+    try:
+        applied = retry_on_lock(apply, attempts=app.config["DB_LOCK_RETRIES"])
+    except OperationalError:
+        return jsonify({"error": "Inventory is busy, please retry"}), 503
+    if applied is None:
+        available = db.session.query(Inventory.quantity).filter(Inventory.id == product_id).scalar()
+        return jsonify(
+            {"error": f"Insufficient stock. Available: {available}"}
+        ), 400
+    transaction, remaining = applied
+    events.publish("transaction.create", [transaction.to_dict()])
+    events.publish("inventory.stock", [{"id": str(product_id), "quantity": remaining}])
 
     return jsonify(
         {
@@ -358,124 +517,682 @@ def create_transaction():
         }
     ), 201
 
+@app.route("/api/transactions/batch", methods=["POST"])
+@jwt_required()
+def create_transaction_batch():
+    """Check out a whole cart in one DB transaction.
+
+    Body: ``{"transaction_type": "sale", "items": [{"sku_id" | "name", "quantity"}, ...]}``.
+    Either every line is applied or none is.
+    """
+    data = request.get_json(silent=True) or {}
+    lines = data.get("items")
+    transaction_type = data.get("transaction_type", "sale")
+
+    if transaction_type not in ("sale", "purchase"):
+        return jsonify({"error": "Invalid transaction type. Use 'sale' or 'purchase'"}), 400
+    if not isinstance(lines, list) or not lines:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    max_lines = app.config["CHECKOUT_MAX_LINES"]
+    if len(lines) > max_lines:
+        return jsonify({"error": f"Too many items: {len(lines)} (max {max_lines})"}), 400
+
+    parsed = []
+    for idx, line in enumerate(lines):
+        if not isinstance(line, dict):
+            return jsonify({"error": f"items[{idx}]: expected an object"}), 400
+        sku_id, name = line.get("sku_id") or "", line.get("name") or ""
+        if not isinstance(sku_id, str) or not isinstance(name, str):
+            return jsonify({"error": f"items[{idx}]: sku_id and name must be strings"}), 400
+        sku_id, name = sku_id.strip(), name.strip()
+        if not sku_id and not name:
+            return jsonify({"error": f"items[{idx}]: sku_id or name is required"}), 400
+        try:
+            quantity = int(line.get("quantity"))
+        except (ValueError, TypeError):
+            return jsonify({"error": f"items[{idx}]: invalid quantity"}), 400
+        if quantity <= 0:
+            return jsonify({"error": f"items[{idx}]: quantity must be positive"}), 400
+        parsed.append((sku_id, name.lower(), quantity))
+
+    # Resolve every line in one query
+    skus = {sku for sku, _, _ in parsed if sku}
+    names = {name for sku, name, _ in parsed if not sku}
+    matches = (
+        Inventory.query.filter(
+            Inventory.status != "deleted",
+            db.or_(Inventory.sku_id.in_(skus), db.func.lower(Inventory.name).in_(names)),
+        )
+        .order_by(Inventory.id)
+        .all()
+    )
+    by_sku = {i.sku_id: i for i in matches if i.sku_id}
+    by_name = {}
+    for item in matches:
+        by_name.setdefault(item.name.lower(), item)
+
+    resolved = []
+    wanted = {}
+    today = date.today()
+    for idx, (sku_id, name, quantity) in enumerate(parsed):
+        item = by_sku.get(sku_id) if sku_id else by_name.get(name)
+        if item is None:
+            return jsonify({"error": f"items[{idx}]: item not found in inventory"}), 404
+        if transaction_type == "sale" and item.expiry and item.expiry < today:
+            return jsonify({"error": f"items[{idx}]: {item.name} is expired and cannot be sold"}), 400
+        wanted[item.id] = wanted.get(item.id, 0) + quantity
+        resolved.append((item, quantity))
+
+    if transaction_type == "sale":
+        for idx, (item, _) in enumerate(resolved):
+            if item.quantity < wanted[item.id]:
+                return jsonify(
+                    {"error": f"items[{idx}]: Insufficient stock for {item.name}. Available: {item.quantity}"}
+                ), 400
+
+    now = datetime.utcnow()
+    sign = 1 if transaction_type == "sale" else -1
+    rows = [
+        {
+            "product_id": item.id,
+            "product_name": item.name,
+            "transaction_type": transaction_type,
+            "product_quantity": quantity,
+            "total_price": round(sign * quantity * item.price, 2),
+            "time_of_transaction": now,
+        }
+        for item, quantity in resolved
+    ]
+    stock_params = [{"b_id": product_id, "b_qty": qty} for product_id, qty in wanted.items()]
+
+    def apply():
+        inventory = Inventory.__table__
+        stock = db.update(inventory).where(inventory.c.id == db.bindparam("b_id")).values(content_hash=None)
+        if transaction_type == "sale":
+            # Same conditional decrement as create_transaction, one executemany
+            stmt = stock.where(inventory.c.quantity >= db.bindparam("b_qty")).values(
+                quantity=inventory.c.quantity - db.bindparam("b_qty")
+            )
+        else:
+            stmt = stock.values(quantity=inventory.c.quantity + db.bindparam("b_qty"))
+        result = db.session.connection().execute(stmt, stock_params)
+        if result.rowcount != len(stock_params):
+            # Stock moved since validation; nothing has been written
+            db.session.rollback()
+            return None
+        ids = db.session.scalars(
+            db.insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True), rows
+        ).all()
+        record_daily_sales(db.session, rows)
+        bump_table_versions_on_commit(db.session, {"inventory", "transaction"})
+        remaining = db.session.execute(
+            db.select(Inventory.id, Inventory.quantity).where(Inventory.id.in_(list(wanted)))
+        ).all()
+        db.session.commit()
+        return ids, remaining
+
+    try:
+        applied = retry_on_lock(apply, attempts=app.config["DB_LOCK_RETRIES"])
+    except OperationalError:
+        return jsonify({"error": "Inventory is busy, please retry"}), 503
+    if applied is None:
+        return jsonify({"error": "Insufficient stock: inventory changed during checkout, please retry"}), 409
+
+    ids, remaining = applied
+    transactions = [
+        Transaction(id=tid, **row).to_dict() for tid, row in zip(ids, rows)
+    ]
+    events.publish("transaction.create", transactions)
+    events.publish("inventory.stock", [{"id": str(pid), "quantity": qty} for pid, qty in remaining])
+    return jsonify(
+        {
+            "message": "Checkout completed",
+            "transaction_type": transaction_type,
+            "total_quantity": sum(r["product_quantity"] for r in rows),
+            "total_price": round(sum(r["total_price"] for r in rows), 2),
+            "transactions": transactions,
+        }
+    ), 201
+
+
 @app.route("/inventory", methods=["GET"])
 def get_inventory_all():
-    inventory_items = Inventory.query.all()
-
-    result = []
-    for item in inventory_items:
-        result.append({
-            "id": item.id,
-            "name": item.name,
-            "expiry": item.expiry.isoformat() if item.expiry else None,
-            "quantity": item.quantity,
-            "category": item.category,
-            "price": item.price,
-            "description": item.description
-        })
-
-    return jsonify(result), 200
-
-@app.route("/predict", methods=["GET"])
-def predict_product():
-    sku_id = request.args.get('sku_id')
-    date = request.args.get('date')
-    temp = request.args.get('temp')
-    rain = request.args.get('rain')
-    holiday = request.args.get('holiday')
-
-    return jsonify({
-        'prediction': predict_from_saved_model(sku_id, date, temp, rain, holiday)
-    }), 200
+    etag = table_etag("inventory")
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+    return inventory_listing(Inventory.query, LEGACY_INVENTORY_FIELDS, etag, newest_first=False)
 
 
-def predict_from_saved_model(sku_id, date, temp, rain, holiday):
-    model_path = os.path.join('saved_models', f"{sku_id}.pkl")
+# Row shape of the legacy /inventory route (numeric id, no sku_id/status)
+LEGACY_INVENTORY_FIELDS = {
+    "id": lambda v: v,
+    "name": lambda v: v,
+    "expiry": lambda v: v.isoformat() if v else None,
+    "quantity": lambda v: v,
+    "category": lambda v: v,
+    "price": lambda v: v,
+    "description": lambda v: v,
+}
 
-    if os.path.exists(model_path):
-        model = joblib.load(model_path)
 
-        input_df = pd.DataFrame({
-            'ds': [pd.to_datetime(date)],
-            'temp_c': [temp],
-            'rain_mm': [rain],
-            'is_holiday': [holiday]
-        })
+# Rows fetched per round trip when streaming transactions
+TRANSACTIONS_CHUNK = 500
 
-        forecast = model.predict(input_df)
-        return forecast['yhat'].iloc[0]
-    else:
-        return "Model not found!"
 
 @app.route("/api/transactions", methods=["GET"])
 @jwt_required()
 def get_transactions():
-    transactions = Transaction.query.order_by(
-        Transaction.time_of_transaction.desc()
-    ).all()
-    return jsonify([t.to_dict() for t in transactions]), 200
+    """Newest-first transactions, filtered server-side.
+
+    * ``?limit=&cursor=`` — one keyset page: ``{"items", "nextCursor"}``
+    * ``?stream=true`` — NDJSON, one row per line, for full exports
+    * neither — the whole (filtered) list as a JSON array, as before
+
+    Rows are read in chunks from a server-side cursor in the streaming
+    modes, so exports never hold the full history in memory.
+    """
+    try:
+        query = filtered_transactions(request.args)
+        cursor = request.args.get("cursor")
+        if cursor:
+            ts, row_id = decode_cursor(cursor)
+            key = (datetime.fromisoformat(ts), cursor_int(row_id))
+            query = query.filter(db.tuple_(Transaction.time_of_transaction, Transaction.id) < key)
+        limit = request.args.get("limit")
+        limit = int(limit) if limit not in (None, "") else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid from, to, productId, cursor or limit"}), 400
+    max_limit = app.config["TRANSACTIONS_MAX_PAGE_SIZE"]
+    if limit is not None and not 1 <= limit <= max_limit:
+        return jsonify({"error": f"limit must be between 1 and {max_limit}"}), 400
+
+    if request.args.get("stream", "false").lower() == "true":
+        if limit is not None:
+            query = query.limit(limit)
+
+        def generate():
+            for t in query.yield_per(TRANSACTIONS_CHUNK):
+                yield json.dumps(t.to_dict()) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    if limit is not None or cursor:
+        if limit is None:
+            limit = app.config["TRANSACTIONS_PAGE_SIZE"]
+        rows = query.limit(limit + 1).all()
+        items, more = rows[:limit], len(rows) > limit
+        return jsonify({
+            "items": [t.to_dict() for t in items],
+            "nextCursor": encode_cursor(items[-1].time_of_transaction.isoformat(), items[-1].id) if more else None,
+        }), 200
+
+    def generate_array():
+        yield "["
+        for i, t in enumerate(query.yield_per(TRANSACTIONS_CHUNK)):
+            yield ("," if i else "") + json.dumps(t.to_dict())
+        yield "]"
+
+    return Response(stream_with_context(generate_array()), mimetype="application/json")
+
+
+def filtered_transactions(args):
+    """Transaction query for the from/to/productId/type filters, newest first.
+
+    ``from``/``to`` are inclusive YYYY-MM-DD dates. Raises ValueError on bad input.
+    """
+    query = Transaction.query
+    if args.get("from"):
+        query = query.filter(Transaction.time_of_transaction >= datetime.strptime(args["from"], "%Y-%m-%d"))
+    if args.get("to"):
+        end = datetime.strptime(args["to"], "%Y-%m-%d") + timedelta(days=1)
+        query = query.filter(Transaction.time_of_transaction < end)
+    if args.get("productId"):
+        query = query.filter(Transaction.product_id == int(args["productId"]))
+    if args.get("type"):
+        query = query.filter(Transaction.transaction_type == args["type"])
+    return query.order_by(Transaction.time_of_transaction.desc(), Transaction.id.desc())
 
 
 # ================================================================
 # EXPIRY RADAR
 # ================================================================
+EXPIRY_BUCKETS = ("expired", "expiringSoon", "safe")
+
+
 @app.route("/api/expiry-radar", methods=["GET"])
 def get_expiry_radar():
+    """Inventory split into expired / expiringSoon / safe, computed in SQL.
+
+    * no paging params — every bucket in full, as before
+    * ``?limit=N`` — the first N items of each bucket plus ``nextCursors``
+    * ``?bucket=safe&limit=N&cursor=`` — one page of a single bucket
+    """
     try:
         days = int(request.args.get("days", "30"))
     except ValueError:
         days = 30
 
     category = request.args.get("category", "").strip()
+    bucket = request.args.get("bucket", "").strip()
+    if bucket and bucket not in EXPIRY_BUCKETS:
+        return jsonify({"error": f"bucket must be one of: {', '.join(EXPIRY_BUCKETS)}"}), 400
+    try:
+        limit = request.args.get("limit")
+        limit = int(limit) if limit not in (None, "") else None
+        cursor = request.args.get("cursor")
+        position = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid cursor or limit"}), 400
+    max_limit = app.config["INVENTORY_MAX_PAGE_SIZE"]
+    if limit is not None and not 1 <= limit <= max_limit:
+        return jsonify({"error": f"limit must be between 1 and {max_limit}"}), 400
+    if cursor and not bucket:
+        return jsonify({"error": "cursor requires bucket"}), 400
 
     query = Inventory.query.filter(Inventory.status != "deleted")
     if category:
         query = query.filter(db.func.lower(Inventory.category) == category.lower())
 
-    items = query.all()
     today = date.today()
+    cutoff = today + timedelta(days=days)
+    counts = derived_cache.get_or_compute(
+        ("expiry-counts", today, days, category.lower()),
+        (get_table_versions().get("inventory"),),
+        lambda: expiry_counts(query, today, cutoff),
+    )
 
-    expired, expiring_soon, safe = [], [], []
-
-    for item in items:
+    try:
+        if bucket:
+            items, next_cursor = expiry_bucket_page(query, bucket, today, cutoff, limit, position)
+            return jsonify({"bucket": bucket, "items": items, "nextCursor": next_cursor, "counts": counts}), 200
+
+        body = {"counts": counts}
+        next_cursors = {}
+        for name in EXPIRY_BUCKETS:
+            body[name], next_cursors[name] = expiry_bucket_page(query, name, today, cutoff, limit)
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid cursor"}), 400
+    if limit is not None:
+        body["nextCursors"] = next_cursors
+    return jsonify(body), 200
+
+
+def expiry_counts(query, today, cutoff):
+    expiry = Inventory.expiry
+    total, expired, soon = query.with_entities(
+        db.func.count(Inventory.id),
+        db.func.sum(db.case((expiry <= today, 1), else_=0)),
+        db.func.sum(db.case((db.and_(expiry > today, expiry <= cutoff), 1), else_=0)),
+    ).one()
+    expired, soon = expired or 0, soon or 0
+    return {"total": total, "expired": expired, "expiringSoon": soon, "safe": total - expired - soon}
+
+
+def expiry_bucket_page(query, bucket, today, cutoff, limit=None, position=None):
+    """Items of one radar bucket, soonest expiry first, and the next cursor.
+
+    A bucket is one or two index range scans ("segments"); items without an
+    expiry date come last in "safe". ``position`` is a decoded cursor:
+    ``[segment, expiry, id]`` of the last item already returned.
+    """
+    expiry = Inventory.expiry
+    if bucket == "expired":
+        segments = [expiry <= today]
+    elif bucket == "expiringSoon":
+        segments = [db.and_(expiry > today, expiry <= cutoff)]
+    else:
+        segments = [expiry > cutoff, expiry.is_(None)]
+
+    start, after_expiry, after_id = position or (0, None, None)
+    if position is not None:
+        start, after_id = cursor_int(start), cursor_int(after_id)
+        if start >= len(segments):
+            raise ValueError("invalid cursor")
+    if after_expiry is not None:
+        after_expiry = date.fromisoformat(after_expiry)
+
+    found = []
+    for seg in range(start, len(segments)):
+        seg_query = query.filter(segments[seg])
+        if seg == start and after_id is not None:
+            if after_expiry is None:
+                seg_query = seg_query.filter(Inventory.id > after_id)
+            else:
+                # Spelled out rather than a row-value compare so the expiry index can seek
+                seg_query = seg_query.filter(
+                    expiry >= after_expiry, db.or_(expiry > after_expiry, Inventory.id > after_id)
+                )
+        seg_query = seg_query.order_by(expiry, Inventory.id)
+        if limit is not None:
+            seg_query = seg_query.limit(limit + 1 - len(found))
+        found.extend((seg, item) for item in seg_query)
+        if limit is not None and len(found) > limit:
+            break
+
+    next_cursor = None
+    if limit is not None and len(found) > limit:
+        found = found[:limit]
+        seg, last = found[-1]
+        next_cursor = encode_cursor(seg, last.expiry.isoformat() if last.expiry else None, last.id)
+
+    items = []
+    for _, item in found:
         d = item.to_dict()
-        delta = (item.expiry - today).days if item.expiry else 9999
-        d["daysToExpiry"] = delta
-
-        if delta <= 0:
-            d["expiryStatus"] = "expired"
-            expired.append(d)
-        elif delta <= days:
-            d["expiryStatus"] = "expiringSoon"
-            expiring_soon.append(d)
-        else:
-            d["expiryStatus"] = "safe"
-            safe.append(d)
+        d["daysToExpiry"] = (item.expiry - today).days if item.expiry else 9999
+        d["expiryStatus"] = bucket
+        items.append(d)
+    return items, next_cursor
 
-    expired.sort(key=lambda x: x["daysToExpiry"])
-    expiring_soon.sort(key=lambda x: x["daysToExpiry"])
-    safe.sort(key=lambda x: x["daysToExpiry"])
 
-    return jsonify(
-        {
-            "expired": expired,
-            "expiringSoon": expiring_soon,
-            "safe": safe,
-            "counts": {
-                "total": len(items),
-                "expired": len(expired),
-                "expiringSoon": len(expiring_soon),
-                "safe": len(safe),
-            },
-        }
-    ), 200
+# ================================================================
+# ANALYTICS
+# ================================================================
+@app.route("/api/analytics/daily", methods=["GET"])
+@jwt_required()
+def get_analytics_daily():
+    """Units, revenue and transaction count per day, from the daily_sales rollup.
+
+    ``from``/``to`` are inclusive YYYY-MM-DD dates (default: the last 30
+    days); ``productId`` and ``type`` (default ``sale``) narrow the rows.
+    Days without transactions are returned as zeros.
+    """
+    today = datetime.utcnow().date()
+    try:
+        start, end, product_id, kind = analytics_params(request.args, today - timedelta(days=30), today)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    totals = daily_totals(start, end, product_id, kind)
+    days = []
+    day = start
+    while day <= end:
+        units, revenue, count = totals.get(day, (0, 0.0, 0))
+        days.append({"date": day.isoformat(), "units": units, "revenue": round(revenue, 2), "transactions": count})
+        day += timedelta(days=1)
+    return jsonify({"from": start.isoformat(), "to": end.isoformat(), "type": kind, "days": days}), 200
+
+
+@app.route("/api/analytics/monthly", methods=["GET"])
+@jwt_required()
+def get_analytics_monthly():
+    """Per-month totals (``YYYY-MM``) from the daily_sales rollup.
+
+    Same parameters as /api/analytics/daily; the default range is the
+    current month and the eleven before it.
+    """
+    today = datetime.utcnow().date()
+    try:
+        start, end, product_id, kind = analytics_params(request.args, shift_months(today, -11).replace(day=1), today)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    months = {}
+    cursor = start.replace(day=1)
+    while cursor <= end:
+        months[cursor.strftime("%Y-%m")] = [0, 0.0, 0]
+        cursor = (cursor + timedelta(days=31)).replace(day=1)
+    for day, (units, revenue, count) in daily_totals(start, end, product_id, kind).items():
+        bucket = months[day.strftime("%Y-%m")]
+        bucket[0] += units
+        bucket[1] += revenue
+        bucket[2] += count
+    return jsonify({
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "type": kind,
+        "months": [
+            {"month": key, "units": units, "revenue": round(revenue, 2), "transactions": count}
+            for key, (units, revenue, count) in months.items()
+        ],
+    }), 200
+
+
+# Overview ranges, as offered by the dashboard's range chips: (days, months)
+OVERVIEW_RANGES = {
+    "1d": (1, 0), "7d": (7, 0), "1m": (0, 1), "3m": (0, 3),
+    "6m": (0, 6), "1y": (0, 12), "3y": (0, 36), "5y": (0, 60),
+}
+
+
+@app.route("/api/analytics/overview", methods=["GET"])
+@jwt_required()
+def get_analytics_overview():
+    """Dashboard KPIs for ``?range=`` (default ``1m``) and the period before it.
+
+    Sales figures come from the daily_sales rollup, stock figures from one
+    GROUP BY over active inventory; each part is cached until the next
+    write to the tables it reads.
+    """
+    key = request.args.get("range", "1m")
+    if key not in OVERVIEW_RANGES:
+        return jsonify({"error": f"range must be one of: {', '.join(OVERVIEW_RANGES)}"}), 400
+    days, months = OVERVIEW_RANGES[key]
+
+    end = datetime.utcnow().date()
+    start = shift_months(end, -months) - timedelta(days=days)
+    prev_end = start - timedelta(days=1)
+    prev_start = prev_end - (end - start)
+
+    versions = get_table_versions()
+    sales_versions = (versions.get("transaction"), versions.get("daily_sales"))
+    current = derived_cache.get_or_compute(
+        ("overview-sales", start, end), sales_versions, lambda: period_totals(start, end)
+    )
+    previous = derived_cache.get_or_compute(
+        ("overview-sales", prev_start, prev_end), sales_versions, lambda: period_totals(prev_start, prev_end)
+    )
+    stock = derived_cache.get_or_compute(("overview-stock",), (versions.get("inventory"),), inventory_totals)
+
+    return jsonify({
+        "range": key,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "current": current,
+        "previous": {"from": prev_start.isoformat(), "to": prev_end.isoformat(), **previous},
+        **stock,
+    }), 200
+
+
+def shift_months(day, months):
+    """``day`` moved by whole calendar months, clamped to the month's last day."""
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+    next_first = date(year + month // 12, month % 12 + 1, 1)
+    return date(year, month, min(day.day, (next_first - timedelta(days=1)).day))
+
+
+def period_totals(start, end):
+    rows = db.session.query(
+        DailySales.transaction_type,
+        db.func.sum(DailySales.units),
+        db.func.sum(DailySales.revenue),
+        db.func.sum(DailySales.transactions),
+    ).filter(DailySales.day.between(start, end)).group_by(DailySales.transaction_type)
+    totals = {kind: (units, revenue, count) for kind, units, revenue, count in rows}
+    units, revenue, orders = totals.get("sale", (0, 0.0, 0))
+    _, spend, _ = totals.get("purchase", (0, 0.0, 0))
+    return {
+        "revenue": round(revenue, 2),
+        "purchases": round(abs(spend), 2),
+        "unitsSold": units,
+        "orders": orders,
+        "transactions": sum(count for _, _, count in totals.values()),
+        "avgOrderValue": round(revenue / orders, 2) if orders else 0.0,
+    }
+
+
+def inventory_totals():
+    value = Inventory.quantity * Inventory.price
+    rows = (
+        db.session.query(
+            Inventory.category,
+            db.func.count(Inventory.id),
+            db.func.sum(Inventory.quantity),
+            db.func.sum(value),
+        )
+        .filter(Inventory.status != "deleted")
+        .group_by(Inventory.category)
+        .all()
+    )
+    categories = sorted(
+        (
+            {"name": category or "Uncategorized", "items": items, "units": units or 0, "value": round(total or 0, 2)}
+            for category, items, units, total in rows
+        ),
+        key=lambda c: (-c["units"], c["name"]),
+    )
+    return {
+        "inventory": {
+            "items": sum(c["items"] for c in categories),
+            "units": sum(c["units"] for c in categories),
+            "value": round(sum(total or 0 for _, _, _, total in rows), 2),
+        },
+        "categories": categories,
+    }
+
+
+def analytics_params(args, default_start, default_end):
+    """(start, end, productId, type) from the query string; raises ValueError."""
+    try:
+        start = datetime.strptime(args["from"], "%Y-%m-%d").date() if args.get("from") else default_start
+        end = datetime.strptime(args["to"], "%Y-%m-%d").date() if args.get("to") else default_end
+        product_id = int(args["productId"]) if args.get("productId") else None
+    except ValueError:
+        raise ValueError("Invalid from, to or productId")
+    kind = args.get("type", "sale")
+    if kind not in ("sale", "purchase"):
+        raise ValueError("type must be 'sale' or 'purchase'")
+    if end < start:
+        raise ValueError("to must not be before from")
+    max_days = app.config["ANALYTICS_MAX_DAYS"]
+    if (end - start).days + 1 > max_days:
+        raise ValueError(f"Range too long (max {max_days} days)")
+    return start, end, product_id, kind
+
+
+def daily_totals(start, end, product_id, kind):
+    """``{day: (units, revenue, transactions)}`` for days with rows; cached per write."""
+
+    def compute():
+        query = db.session.query(
+            DailySales.day,
+            db.func.sum(DailySales.units),
+            db.func.sum(DailySales.revenue),
+            db.func.sum(DailySales.transactions),
+        ).filter(
+            DailySales.day.between(start, end),
+            DailySales.transaction_type == kind,
+        )
+        if product_id is not None:
+            query = query.filter(DailySales.product_id == product_id)
+        return {day: (units, revenue, count) for day, units, revenue, count in query.group_by(DailySales.day)}
+
+    versions = get_table_versions()
+    return derived_cache.get_or_compute(
+        ("daily-sales", start, end, product_id, kind),
+        (versions.get("transaction"), versions.get("daily_sales")),
+        compute,
+    )
+
+
+# ================================================================
+# EVENTS
+# ================================================================
+EVENT_TOPICS = {"inventory", "transaction", "category"}
+
+
+@app.route("/api/events", methods=["GET"])
+# EventSource cannot send headers, so the token may also come as ?jwt=
+@jwt_required(locations=["headers", "query_string"])
+def get_events():
+    """Server-Sent Events stream of changes made through this API.
+
+    ``?topics=inventory,transaction,category`` limits the feed (default all).
+    A reconnecting EventSource sends ``Last-Event-ID`` and receives what it
+    missed, or a ``reset`` event if that is no longer buffered.
+    """
+    topics = {t.strip() for t in request.args.get("topics", "").split(",") if t.strip()}
+    if topics - EVENT_TOPICS:
+        return jsonify({"error": f"Unknown topics: {', '.join(sorted(topics - EVENT_TOPICS))}"}), 400
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+    sub = events.subscribe(last_event_id, topics)
+    if sub is None:
+        return jsonify({"error": "Too many event stream clients, please retry"}), 503
+
+    # No stream_with_context: the request context (and its DB session) ends
+    # here, so an idle stream holds no connection
+    response = Response(events.stream(sub, app.config["EVENTS_HEARTBEAT_SECONDS"]), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    # Also covers a client that leaves before the stream starts
+    response.call_on_close(lambda: events.unsubscribe(sub))
+    return response
+
+
+# ================================================================
+# METRICS
+# ================================================================
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Prometheus text format; see metrics.py for what is recorded."""
+    if not app.config["METRICS_ENABLED"]:
+        return jsonify({"error": "Resource not found"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@metrics.registry.collector
+def cache_metrics():
+    caches = {"derived": (derived_cache.hits, derived_cache.misses)}
+    registry = loaded_model_registry()
+    if registry is not None:
+        stats = registry.stats()
+        caches["models"] = (stats["hits"], stats["misses"])
+    yield ("cache_hits_total", "counter", "Cache lookups served from memory",
+           [({"cache": name}, hits) for name, (hits, _) in caches.items()])
+    yield ("cache_misses_total", "counter", "Cache lookups that had to compute or load",
+           [({"cache": name}, misses) for name, (_, misses) in caches.items()])
+    yield ("cache_hit_ratio", "gauge", "Hits over lookups since start",
+           [({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+            for name, (hits, misses) in caches.items()])
+    yield ("event_stream_clients", "gauge", "Open GET /api/events streams", [({}, events.client_count)])
+
+
+# ================================================================
+# HEALTH
+# ================================================================
+@app.route("/healthz/live", methods=["GET"])
+def healthz_live():
+    return jsonify({"status": "ok"}), 200
+
+
+@app.route("/healthz/ready", methods=["GET"])
+def healthz_ready():
+    return jsonify({"ready": warmup.ready, "warmup": warmup.snapshot()}), 200 if warmup.ready else 503
 
 
 # ----------------------------------------------------------------
 # INIT
 # ----------------------------------------------------------------
 with app.app_context():
+    if app.config["DB_PROFILE"] == "production":
+        install_sqlite_pragmas(db.engine, app.config["SQLITE_PRAGMAS"])
     db.create_all()
+    add_missing_columns()
+    create_missing_indexes()
+    inventory_search = install_inventory_search(db.engine, Inventory)
+    if app.config["METRICS_ENABLED"]:
+        metrics.install_instrumentation(
+            app,
+            db.engine,
+            server_timing_header=app.config["SERVER_TIMING"],
+            slow_ms=app.config["PROFILE_SLOW_MS"],
+            sample_ms=app.config["PROFILE_SAMPLE_MS"],
+            profile_dir=app.config["PROFILE_DIR"],
+        )
+
+if app.config["FORECAST_WARMUP"]:
+    start_warmup(app)
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+backend/cache.py
+
+Small in-process cache for derived read results.
+
+Entries are keyed by the request parameters *and* the write counters of the
+tables they were computed from (see ``models.TableVersion``). A write in any
+process bumps the counter, so the next read in every process misses and
+recomputes; nothing has to be invalidated explicitly.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class VersionedCache:
+    """Thread-safe LRU of computed values keyed by (key, versions)."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, versions: Hashable, compute: Callable[[], Any]) -> Any:
+        full_key = (key, versions)
+        with self._lock:
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return self._entries[full_key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[full_key] = value
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Derived read results (risk, analytics), keyed by table write counters
+derived_cache = VersionedCache()
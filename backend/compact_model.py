@@ -0,0 +1,253 @@
+"""
+backend/compact_model.py
+
+Compact, memory-mappable artifact for fitted Prophet models.
+
+A full Prophet pickle drags along the training history, Stan fit output and
+pandas internals. Predicting only needs a few dozen floats: trend
+changepoints and k/m/delta, Fourier coefficients per seasonality and the
+extra-regressor betas. ``CompactProphet`` stores exactly those in a
+single-record structured ``.npy`` file (loadable with ``mmap_mode="r"``) and
+re-implements Prophet's MAP prediction path in plain NumPy.
+
+Supported models: linear or flat growth, additive or multiplicative
+seasonalities/regressors, no holidays, no conditional seasonalities, no MCMC.
+``CompactProphet.from_prophet`` raises ValueError for anything else.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Mapping
+
+import joblib
+import numpy as np
+
+COMPACT_SUFFIX = ".npy"
+FORMAT_VERSION = 1
+
+_DAY_NS = 86_400 * 10**9
+_SEASONALITY_PREFIX = "seasonality:"
+_REGRESSOR_PREFIX = "regressor:"
+_GROWTH_CODES = {"linear": 0, "flat": 1}
+_SCALARS = (
+    "version", "growth", "y_scale", "floor", "start", "t_scale", "k", "m",
+    "sigma_obs", "interval_width", "uncertainty_samples", "hist_dt",
+)
+
+
+def to_days(ds: Any) -> np.ndarray:
+    """Days since the Unix epoch (float64) for an array-like of dates."""
+    arr = np.asarray(ds, dtype="datetime64[ns]")
+    return arr.astype(np.int64) / _DAY_NS
+
+
+class CompactProphet:
+    """Prediction-only view of a fitted Prophet model."""
+
+    def __init__(self, record: np.ndarray) -> None:
+        self.record = record
+        names = record.dtype.names
+        self.growth = int(record["growth"])
+        self.y_scale = float(record["y_scale"])
+        self.floor = float(record["floor"])
+        self.start = float(record["start"])
+        self.t_scale = float(record["t_scale"])
+        self.k = float(record["k"])
+        self.m = float(record["m"])
+        self.sigma_obs = float(record["sigma_obs"])
+        self.interval_width = float(record["interval_width"])
+        self.uncertainty_samples = int(record["uncertainty_samples"])
+        self.hist_dt = float(record["hist_dt"])
+        self.changepoints_t = np.asarray(record["changepoints_t"], dtype=np.float64)
+        self.delta = np.asarray(record["delta"], dtype=np.float64)
+        # name -> (period, multiplicative, betas[2 * order])
+        self.seasonalities = {
+            n[len(_SEASONALITY_PREFIX):]: (float(record[n][0]), bool(record[n][1]), np.asarray(record[n][2:]))
+            for n in names if n.startswith(_SEASONALITY_PREFIX)
+        }
+        # name -> (mu, std, beta, multiplicative)
+        self.regressors = {
+            n[len(_REGRESSOR_PREFIX):]: (float(record[n][0]), float(record[n][1]), float(record[n][2]), bool(record[n][3]))
+            for n in names if n.startswith(_REGRESSOR_PREFIX)
+        }
+
+    # ------------------------------------------------------------------
+    # Conversion and (de)serialization
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_prophet(cls, model: Any) -> "CompactProphet":
+        """Extract the prediction parameters from a fitted Prophet model."""
+        if model.growth not in _GROWTH_CODES:
+            raise ValueError(f"unsupported growth: {model.growth}")
+        if model.mcmc_samples:
+            raise ValueError("MCMC-fitted models are not supported")
+        if model.holidays is not None or model.country_holidays is not None:
+            raise ValueError("models with holidays are not supported")
+        if any(p["condition_name"] is not None for p in model.seasonalities.values()):
+            raise ValueError("conditional seasonalities are not supported")
+
+        beta = np.nanmean(model.params["beta"], axis=0)
+        delta = np.nanmean(model.params["delta"], axis=0)
+        values: dict[str, Any] = {
+            "version": FORMAT_VERSION,
+            "growth": _GROWTH_CODES[model.growth],
+            "y_scale": model.y_scale,
+            "floor": model.y_min if model.scaling == "minmax" else 0.0,
+            "start": to_days([model.start])[0],
+            "t_scale": model.t_scale / np.timedelta64(1, "D"),
+            "k": np.nanmean(model.params["k"]),
+            "m": np.nanmean(model.params["m"]),
+            "sigma_obs": np.nanmean(model.params["sigma_obs"]),
+            "interval_width": model.interval_width,
+            "uncertainty_samples": model.uncertainty_samples or 0,
+            "hist_dt": float(np.diff(model.history["t"]).mean()),
+            "changepoints_t": np.asarray(model.changepoints_t, dtype=np.float64),
+            "delta": delta,
+        }
+        fields = [(name, np.float64) for name in _SCALARS]
+        fields += [("changepoints_t", np.float64, delta.shape), ("delta", np.float64, delta.shape)]
+
+        # beta columns follow make_all_seasonality_features: seasonalities in
+        # order (sin/cos pairs), then extra regressors
+        col = 0
+        for name, props in model.seasonalities.items():
+            width = 2 * props["fourier_order"]
+            key = _SEASONALITY_PREFIX + name
+            values[key] = np.concatenate((
+                [props["period"], props["mode"] == "multiplicative"], beta[col:col + width]
+            ))
+            fields.append((key, np.float64, (2 + width,)))
+            col += width
+        for name, props in model.extra_regressors.items():
+            key = _REGRESSOR_PREFIX + name
+            values[key] = [props["mu"], props["std"], beta[col], props["mode"] == "multiplicative"]
+            fields.append((key, np.float64, (4,)))
+            col += 1
+        if col != beta.shape[0]:
+            raise ValueError(f"unexpected beta layout: {col} features for {beta.shape[0]} betas")
+
+        record = np.zeros(1, dtype=np.dtype(fields))
+        for name, value in values.items():
+            record[name] = value
+        return cls(record[0])
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, np.asarray([self.record], dtype=self.record.dtype))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactProphet":
+        arr = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if int(arr[0]["version"]) != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported compact model version {int(arr[0]['version'])}")
+        return cls(arr[0])
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+    def _trend(self, t: np.ndarray) -> np.ndarray:
+        if self.growth == _GROWTH_CODES["flat"]:
+            return np.full_like(t, self.m)
+        deltas_t = (self.changepoints_t[None, :] <= t[:, None]) * self.delta
+        k_t = deltas_t.sum(axis=1) + self.k
+        m_t = (deltas_t * -self.changepoints_t).sum(axis=1) + self.m
+        return k_t * t + m_t
+
+    def _components(self, days: np.ndarray, regressors: Mapping[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+        additive = np.zeros_like(days)
+        multiplicative = np.zeros_like(days)
+        for period, is_mult, betas in self.seasonalities.values():
+            x = 2 * np.pi * days[:, None] / period
+            orders = np.arange(1, betas.shape[0] // 2 + 1)
+            comp = np.sin(x * orders) @ betas[0::2] + np.cos(x * orders) @ betas[1::2]
+            if is_mult:
+                multiplicative += comp
+            else:
+                additive += comp
+        for name, (mu, std, beta, is_mult) in self.regressors.items():
+            if name not in regressors:
+                raise ValueError(f"Regressor {name!r} missing")
+            values = np.asarray(regressors[name], dtype=np.float64)
+            comp = (values - mu) / std * beta
+            if is_mult:
+                multiplicative += comp
+            else:
+                additive += comp
+        return additive * self.y_scale, multiplicative
+
+    def _trend_uncertainty(self, t: np.ndarray, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+        """Simulated future trend shifts, as in Prophet's vectorized sampler."""
+        unc = np.zeros((n_samples, t.shape[0]))
+        future = t > 1
+        if self.growth == _GROWTH_CODES["flat"] or not future.any():
+            return unc
+        order = np.argsort(t, kind="mergesort")
+        future_idx = order[future[order]]
+        n_length = future_idx.shape[0]
+        step = np.diff(t[future_idx]).mean() if n_length > 1 else self.hist_dt
+        likelihood = self.changepoints_t.shape[0] * step
+        mean_delta = np.mean(np.abs(self.delta)) + 1e-8
+
+        changes = rng.uniform(size=(n_samples, n_length)) < likelihood
+        mat = rng.laplace(0, mean_delta, size=changes.shape) * changes
+        mat = (np.hstack([np.zeros((n_samples, 1)), mat])[:, :-1] + mat) / 2
+        unc[:, future_idx] = mat.cumsum(axis=1).cumsum(axis=1) * step
+        return unc
+
+    def predict(
+        self,
+        ds: Any,
+        regressors: Mapping[str, Any],
+        *,
+        intervals: bool = True,
+        rng: np.random.Generator | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Return yhat (and yhat_lower/yhat_upper) aligned with ``ds``."""
+        days = to_days(ds)
+        t = (days - self.start) / self.t_scale
+        trend = self._trend(t) * self.y_scale + self.floor
+        additive, multiplicative = self._components(days, regressors)
+        yhat = trend * (1 + multiplicative) + additive
+        out = {"yhat": yhat}
+        if not intervals:
+            return out
+        if not self.uncertainty_samples:
+            out["yhat_lower"] = out["yhat_upper"] = yhat
+            return out
+
+        rng = rng or np.random.default_rng()
+        n = self.uncertainty_samples
+        trends = (self._trend(t) + self._trend_uncertainty(t, n, rng)) * self.y_scale + self.floor
+        noise = rng.normal(0, self.sigma_obs, trends.shape) * self.y_scale
+        sims = trends * (1 + multiplicative) + additive + noise
+        out["yhat_lower"] = np.percentile(sims, 100 * (1.0 - self.interval_width) / 2, axis=0)
+        out["yhat_upper"] = np.percentile(sims, 100 * (1.0 + self.interval_width) / 2, axis=0)
+        return out
+
+    def predict_frame(self, frame: Mapping[str, Any]) -> dict[str, list[float]]:
+        """``forecast_pool.score_frame`` equivalent for compact models."""
+        regressors = {name: frame[name] for name in self.regressors}
+        out = self.predict(frame["ds"], regressors)
+        return {col: values.astype(float).tolist() for col, values in out.items()}
+
+
+def compact_path_for(pickle_path: str) -> str:
+    return os.path.splitext(pickle_path)[0] + COMPACT_SUFFIX
+
+
+def load_model(path: str) -> Any:
+    """Registry loader: prefer a compact artifact next to the pickle.
+
+    The compact file is only used when it is at least as new as the pickle,
+    so retraining a model without re-converting falls back to Prophet.
+    """
+    compact = compact_path_for(path)
+    try:
+        if os.path.getmtime(compact) >= os.path.getmtime(path):
+            return CompactProphet.load(compact)
+    except OSError:
+        pass
+    return joblib.load(path)
@@ -3,10 +3,80 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///database.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # DB_PROFILE=production: WAL + the SQLite pragmas below on every new
+    # connection, and a sized, pre-pinged, recycled connection pool
+    DB_PROFILE = os.getenv("DB_PROFILE", "default").lower()
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+        "temp_store": "MEMORY",
+    }
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    } if DB_PROFILE == "production" else {}
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-jwt-secret-key")
-    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000")
\ No newline at end of file
+    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000")
+
+    # Attempts for a stock write that hits a locked database before giving up (503)
+    DB_LOCK_RETRIES = int(os.getenv("DB_LOCK_RETRIES", "5"))
+    # Line items accepted by POST /api/transactions/batch
+    CHECKOUT_MAX_LINES = int(os.getenv("CHECKOUT_MAX_LINES", "500"))
+
+    # GET /api/inventory and GET /api/transactions pages (?limit=&cursor=)
+    INVENTORY_PAGE_SIZE = int(os.getenv("INVENTORY_PAGE_SIZE", "100"))
+    INVENTORY_MAX_PAGE_SIZE = int(os.getenv("INVENTORY_MAX_PAGE_SIZE", "1000"))
+    TRANSACTIONS_PAGE_SIZE = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "100"))
+    TRANSACTIONS_MAX_PAGE_SIZE = int(os.getenv("TRANSACTIONS_MAX_PAGE_SIZE", "1000"))
+    # Longest from..to span accepted by /api/analytics/daily and /monthly
+    ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "3660"))
+
+    # GET /api/events (Server-Sent Events): per-client queue, replay buffer
+    # for Last-Event-ID, connection cap and keep-alive interval
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+    EVENTS_REPLAY_SIZE = int(os.getenv("EVENTS_REPLAY_SIZE", "1000"))
+    EVENTS_MAX_CLIENTS = int(os.getenv("EVENTS_MAX_CLIENTS", "500"))
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    # Prometheus metrics at GET /metrics and a Server-Timing header on every
+    # response. PROFILE_SLOW_MS > 0 samples request stacks every
+    # PROFILE_SAMPLE_MS and writes folded stacks for slower requests to PROFILE_DIR
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", "5"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+
+    # Forecasting models (<MODEL_DIR>/<sku_id>.pkl) and the in-memory registry
+    MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(BASE_DIR, "saved_models"))
+    MODEL_CACHE_MAX_MODELS = int(os.getenv("MODEL_CACHE_MAX_MODELS", "256"))
+    MODEL_CACHE_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    # Prefer compact <sku_id>.npy artifacts (scripts/convert_models.py) over pickles
+    MODEL_COMPACT = os.getenv("MODEL_COMPACT", "true").lower() == "true"
+    # Worker processes for multi-SKU forecasts; 0 runs them in the request thread
+    FORECAST_POOL_WORKERS = int(os.getenv("FORECAST_POOL_WORKERS", "0"))
+    PREDICT_BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "20000"))
+
+    # Preload models in the background at startup; /healthz/ready reports progress.
+    # FORECAST_WARMUP_SKUS (comma-separated) overrides the top-N-by-sales choice.
+    FORECAST_WARMUP = os.getenv("FORECAST_WARMUP", "false").lower() == "true"
+    FORECAST_WARMUP_TOP_N = int(os.getenv("FORECAST_WARMUP_TOP_N", "50"))
+    FORECAST_WARMUP_SKUS = [s.strip() for s in os.getenv("FORECAST_WARMUP_SKUS", "").split(",") if s.strip()]
@@ -0,0 +1,140 @@
+"""
+backend/events.py
+
+In-process change feed behind ``GET /api/events`` (Server-Sent Events).
+
+Write endpoints ``publish`` a compact event after they commit, so open
+dashboards apply deltas instead of re-downloading whole lists. Each event
+is serialized into its SSE frame once and appended by reference to every
+matching client's bounded queue. A client that falls ``queue_size`` events
+behind is disconnected; like any dropped EventSource it reconnects with
+``Last-Event-ID``.
+
+The last ``replay_size`` events are kept in a ring buffer, so a
+reconnecting client receives exactly what it missed. When its id is older
+than the buffer, or from before a restart, it gets a ``reset`` event
+instead and should refetch its lists.
+
+An idle client is one blocked thread (a greenlet under gevent/eventlet)
+and an empty deque; it holds no database connection. The bus lives in one
+process, so each worker process only sees the writes it served.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable, Iterator
+
+# Reconnect delay suggested to EventSource clients
+RETRY_MS = 3000
+
+
+class Subscription:
+    """One connected client: a bounded queue of SSE frames and a wake-up flag."""
+
+    __slots__ = ("topics", "queue", "ready", "overflowed")
+
+    def __init__(self, topics: frozenset[str] | None, backlog: list[str]) -> None:
+        self.topics = topics
+        self.queue: deque[str] = deque(backlog)
+        self.ready = threading.Event()
+        self.overflowed = False
+        if backlog:
+            self.ready.set()
+
+
+class EventBus:
+    """Thread-safe fan-out of change events with a Last-Event-ID replay buffer."""
+
+    def __init__(self, *, replay_size: int = 1000, queue_size: int = 256, max_clients: int = 500) -> None:
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        # Event ids are "<epoch>-<seq>"; a new epoch per process start tells
+        # clients their Last-Event-ID no longer refers to this buffer
+        self.epoch = format(time.time_ns() // 1_000_000, "x")
+        self._seq = 0
+        self._replay: deque[tuple[int, str, str]] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, name: str, data: Any) -> None:
+        """Send event ``name`` ("<topic>.<op>") with JSON ``data`` to every subscriber."""
+        topic = name.split(".", 1)[0]
+        body = f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+        with self._lock:
+            self._seq += 1
+            frame = f"id: {self.epoch}-{self._seq}\n{body}"
+            self._replay.append((self._seq, topic, frame))
+            for sub in self._subscribers:
+                if sub.topics is not None and topic not in sub.topics:
+                    continue
+                if len(sub.queue) >= self.queue_size:
+                    sub.overflowed = True
+                else:
+                    sub.queue.append(frame)
+                sub.ready.set()
+
+    def subscribe(self, last_event_id: str | None, topics: Iterable[str] | None = None) -> Subscription | None:
+        """Register a client, queueing what it missed since ``last_event_id``.
+
+        Returns None when ``max_clients`` are already connected.
+        """
+        topics = frozenset(topics) if topics else None
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            sub = Subscription(topics, self._backlog(last_event_id, topics))
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def stream(self, sub: Subscription, heartbeat: float) -> Iterator[str]:
+        """SSE body for ``sub``; unsubscribes when the client goes away.
+
+        A comment line every ``heartbeat`` seconds keeps proxies from closing
+        the idle connection and lets the server notice dead clients.
+        """
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                if not sub.ready.wait(heartbeat):
+                    yield ": keep-alive\n\n"
+                    continue
+                sub.ready.clear()
+                frames = []
+                while sub.queue:
+                    frames.append(sub.queue.popleft())
+                if frames:
+                    yield "".join(frames)
+                if sub.overflowed:
+                    # Too far behind: end the response; the client resumes
+                    # from its last id out of the replay buffer
+                    return
+        finally:
+            self.unsubscribe(sub)
+
+    def _backlog(self, last_event_id: str | None, topics: frozenset[str] | None) -> list[str]:
+        """Frames after ``last_event_id``, or a reset; caller holds the lock."""
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        oldest = self._replay[0][0] if self._replay else self._seq + 1
+        if epoch != self.epoch or not seq.isdigit() or not oldest - 1 <= int(seq) <= self._seq:
+            # The reset carries the current id, so after refetching the
+            # client continues from here
+            return [f"id: {self.epoch}-{self._seq}\nevent: reset\ndata: {{}}\n\n"]
+        after = int(seq)
+        return [
+            frame for event_seq, topic, frame in self._replay
+            if event_seq > after and (topics is None or topic in topics)
+        ]
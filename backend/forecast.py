@@ -0,0 +1,467 @@
+"""
+backend/forecast.py
+
+Forecasting routes (/predict*, /api/forecast/*) and their shared state.
+
+Prophet, pandas and NumPy cost seconds of startup and hundreds of MB of RSS,
+and most processes that import ``app`` (CLI scripts, inventory-only
+workers) never forecast. Nothing heavy is imported at module level here:
+the model registry, process pool and vectorized engine are built on first
+use, and pandas/joblib/compact_model are imported inside the functions
+that need them.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from datetime import datetime, date, timedelta
+
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+
+from cache import derived_cache
+from metrics import MODEL_LOAD_SECONDS, PREDICT_SECONDS, timed
+from model_registry import ModelRegistry
+from models import db, Inventory, Transaction, MaterializedForecast, get_table_versions
+from warmup import Warmup, top_skus_by_volume
+
+forecast = Blueprint("forecast", __name__)
+
+# Background model preloading, reported by /healthz/ready
+warmup = Warmup()
+
+_state_lock = threading.Lock()
+_model_registry = None
+_forecast_engines = None
+_forecast_pool = None
+_forecast_pool_ready = False
+
+
+# ----------------------------------------------------------------
+# Lazily built forecasting state
+# ----------------------------------------------------------------
+def get_model_registry():
+    """Loaded forecasting models, kept warm across /predict calls."""
+    global _model_registry
+    if _model_registry is None:
+        with _state_lock:
+            if _model_registry is None:
+                config = current_app.config
+                compact = config["MODEL_COMPACT"]
+
+                # Runs outside any app context (e.g. the warm-up thread)
+                def loader(path):
+                    with timed(MODEL_LOAD_SECONDS, "model-load"):
+                        if compact:
+                            from compact_model import load_model
+                            return load_model(path)
+                        import joblib
+                        return joblib.load(path)
+
+                _model_registry = ModelRegistry(
+                    config["MODEL_DIR"],
+                    loader=loader,
+                    max_models=config["MODEL_CACHE_MAX_MODELS"],
+                    max_bytes=config["MODEL_CACHE_MAX_BYTES"],
+                )
+    return _model_registry
+
+
+def get_forecast_engines():
+    """Catalog-wide vectorized scoring over every compact artifact in MODEL_DIR."""
+    global _forecast_engines
+    if _forecast_engines is None:
+        with _state_lock:
+            if _forecast_engines is None:
+                from forecast_engine import EngineCache
+                _forecast_engines = EngineCache(current_app.config["MODEL_DIR"])
+    return _forecast_engines
+
+
+def get_forecast_pool():
+    """Optional process pool for multi-SKU forecasts (FORECAST_POOL_WORKERS=0 disables)."""
+    global _forecast_pool, _forecast_pool_ready
+    if not _forecast_pool_ready:
+        with _state_lock:
+            if not _forecast_pool_ready:
+                config = current_app.config
+                if config["FORECAST_POOL_WORKERS"] > 0:
+                    from forecast_pool import ForecastPool
+                    _forecast_pool = ForecastPool(
+                        config["MODEL_DIR"],
+                        config["FORECAST_POOL_WORKERS"],
+                        max_models=config["MODEL_CACHE_MAX_MODELS"],
+                        max_bytes=config["MODEL_CACHE_MAX_BYTES"],
+                        compact=config["MODEL_COMPACT"],
+                    )
+                _forecast_pool_ready = True
+    return _forecast_pool
+
+
+# ================================================================
+# PREDICT
+# ================================================================
+@forecast.route("/predict", methods=["GET"])
+def predict_product():
+    sku_id = request.args.get('sku_id')
+    date = request.args.get('date')
+    temp = request.args.get('temp')
+    rain = request.args.get('rain')
+    holiday = request.args.get('holiday')
+
+    return jsonify({
+        'prediction': predict_from_saved_model(sku_id, date, temp, rain, holiday)
+    }), 200
+
+
+@forecast.route("/predict/models/stats", methods=["GET"])
+def predict_model_stats():
+    return jsonify(get_model_registry().stats()), 200
+
+
+def loaded_model_registry():
+    """The model registry if a request has built it yet, else None."""
+    return _model_registry
+
+
+def lookup_materialized_forecast(sku_id, date, temp, rain, holiday):
+    """Return the precomputed yhat for this exact request, or None.
+
+    Rows are only trusted while the model file they came from is unchanged.
+    """
+    try:
+        key = dict(
+            sku_id=sku_id,
+            ds=datetime.strptime(date, "%Y-%m-%d").date(),
+            temp=float(temp),
+            rain=float(rain),
+            holiday=int(float(holiday)),
+        )
+        mtime = os.path.getmtime(get_model_registry().path_for(sku_id))
+    except (OSError, ValueError, TypeError):
+        return None
+
+    row = MaterializedForecast.query.filter_by(**key).first()
+    if row is None or row.model_mtime != mtime:
+        return None
+    return row.yhat
+
+
+def predict_from_saved_model(sku_id, date, temp, rain, holiday):
+    precomputed = lookup_materialized_forecast(sku_id, date, temp, rain, holiday) if sku_id else None
+    if precomputed is not None:
+        return precomputed
+
+    import pandas as pd
+    from compact_model import CompactProphet
+
+    model = get_model_registry().get(sku_id) if sku_id else None
+
+    if isinstance(model, CompactProphet):
+        with timed(PREDICT_SECONDS, "predict"):
+            forecast = model.predict(
+                [pd.to_datetime(date)],
+                {'temp_c': [float(temp)], 'rain_mm': [float(rain)], 'is_holiday': [float(holiday)]},
+                intervals=False,
+            )
+        return float(forecast['yhat'][0])
+    elif model is not None:
+        input_df = pd.DataFrame({
+            'ds': [pd.to_datetime(date)],
+            'temp_c': [temp],
+            'rain_mm': [rain],
+            'is_holiday': [holiday]
+        })
+
+        with timed(PREDICT_SECONDS, "predict"):
+            forecast = model.predict(input_df)
+        return forecast['yhat'].iloc[0]
+    else:
+        return "Model not found!"
+
+
+@forecast.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    data = request.get_json(silent=True)
+    entries = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "Body must be a non-empty list of forecast requests"}), 400
+
+    max_rows = current_app.config["PREDICT_BATCH_MAX_ROWS"]
+    parsed = []
+    total_rows = 0
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            return jsonify({"error": f"items[{idx}]: expected an object"}), 400
+        sku_id = entry.get("sku_id")
+        sku_id = sku_id.strip() if isinstance(sku_id, str) else ""
+        dates = entry.get("dates")
+        if dates is None and entry.get("date"):
+            dates = [entry["date"]]
+        if not sku_id or not isinstance(dates, list) or not dates:
+            return jsonify({"error": f"items[{idx}]: sku_id and dates are required"}), 400
+        try:
+            ds = [datetime.strptime(d, "%Y-%m-%d") for d in dates]
+        except (ValueError, TypeError):
+            return jsonify({"error": f"items[{idx}]: invalid date format. Use YYYY-MM-DD"}), 400
+        try:
+            temp = float(entry.get("temp", 0))
+            rain = float(entry.get("rain", 0))
+            holiday = int(entry.get("holiday", 0))
+        except (ValueError, TypeError):
+            return jsonify({"error": f"items[{idx}]: invalid temp, rain or holiday"}), 400
+        total_rows += len(ds)
+        parsed.append((sku_id, ds, temp, rain, holiday))
+
+    if total_rows > max_rows:
+        return jsonify({"error": f"Batch too large: {total_rows} rows (max {max_rows})"}), 400
+
+    # One multi-row frame (and one model.predict) per SKU
+    by_sku: dict[str, list[int]] = {}
+    for idx, (sku_id, *_rest) in enumerate(parsed):
+        by_sku.setdefault(sku_id, []).append(idx)
+
+    jobs = []
+    for sku_id, indices in by_sku.items():
+        frame = {"ds": [], "temp_c": [], "rain_mm": [], "is_holiday": []}
+        for idx in indices:
+            _, ds, temp, rain, holiday = parsed[idx]
+            frame["ds"].extend(ds)
+            frame["temp_c"].extend([temp] * len(ds))
+            frame["rain_mm"].extend([rain] * len(ds))
+            frame["is_holiday"].extend([holiday] * len(ds))
+        jobs.append((sku_id, frame))
+
+    def item_results():
+        for sku_id, forecast in score_forecast_jobs(jobs):
+            offset = 0
+            for idx in by_sku[sku_id]:
+                _, ds, *_rest = parsed[idx]
+                if forecast is None:
+                    yield idx, {"sku_id": sku_id, "error": "Model not found!"}
+                    continue
+                end = offset + len(ds)
+                yield idx, {
+                    "sku_id": sku_id,
+                    "predictions": [
+                        {"date": d.strftime("%Y-%m-%d"), "yhat": y, "yhat_lower": lo, "yhat_upper": hi}
+                        for d, y, lo, hi in zip(
+                            ds,
+                            forecast["yhat"][offset:end],
+                            forecast["yhat_lower"][offset:end],
+                            forecast["yhat_upper"][offset:end],
+                        )
+                    ],
+                }
+                offset = end
+
+    if request.args.get("stream", "false").lower() == "true":
+        # NDJSON, one line per request item in completion order
+        def generate():
+            for idx, result in item_results():
+                yield json.dumps({"index": idx, **result}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    results = [None] * len(parsed)
+    for idx, result in item_results():
+        results[idx] = result
+    return jsonify({"results": results}), 200
+
+
+def score_forecast_jobs(jobs):
+    """Yield ``(sku_id, forecast)`` for each SKU job as it completes.
+
+    Fans out to the process pool when FORECAST_POOL_WORKERS is set and there
+    is more than one SKU to score; otherwise runs in this process.
+    """
+    from forecast_pool import score_jobs
+
+    pool = get_forecast_pool()
+    if pool is not None and len(jobs) > 1:
+        return pool.score(jobs)
+    return score_jobs(get_model_registry(), jobs)
+
+
+@forecast.route("/predict/all", methods=["GET"])
+def predict_all():
+    try:
+        start = datetime.strptime(request.args["start"], "%Y-%m-%d").date() if request.args.get("start") else date.today()
+        days = int(request.args.get("days", "30"))
+        temp = float(request.args.get("temp", "25"))
+        rain = float(request.args.get("rain", "0"))
+        holiday = int(request.args.get("holiday", "0"))
+    except ValueError:
+        return jsonify({"error": "Invalid start, days, temp, rain or holiday"}), 400
+    if not 1 <= days <= 366:
+        return jsonify({"error": "days must be between 1 and 366"}), 400
+
+    dates = [datetime.combine(start + timedelta(days=i), datetime.min.time()) for i in range(days)]
+    forecasts = forecast_catalog(dates, temp, rain, holiday)
+    return jsonify({
+        "dates": [d.strftime("%Y-%m-%d") for d in dates],
+        "results": [{"sku_id": sku_id, "yhat": yhat} for sku_id, yhat in sorted(forecasts.items())],
+    }), 200
+
+
+def forecast_catalog(dates, temp, rain, holiday, sku_ids=None):
+    """Return ``{sku_id: [yhat per date]}`` for every model (or ``sku_ids``).
+
+    SKUs with a current compact artifact are scored together by the
+    vectorized engine; the rest go through the per-SKU Prophet path.
+    """
+    if sku_ids is None:
+        registry = get_model_registry()
+        sku_ids = sorted(
+            f[: -len(registry.suffix)] for f in os.listdir(registry.model_dir) if f.endswith(registry.suffix)
+        )
+    engine = get_forecast_engines().get() if current_app.config["MODEL_COMPACT"] else None
+    vectorized = [s for s in sku_ids if engine is not None and s in engine]
+    rest = [s for s in sku_ids if engine is None or s not in engine]
+
+    forecasts = {}
+    if vectorized:
+        regressors = {"temp_c": temp, "rain_mm": rain, "is_holiday": holiday}
+        yhat = engine.predict(dates, regressors, sku_ids=vectorized)
+        forecasts.update(zip(vectorized, yhat.tolist()))
+    if rest:
+        n = len(dates)
+        frame = {"ds": dates, "temp_c": [temp] * n, "rain_mm": [rain] * n, "is_holiday": [holiday] * n}
+        for sku_id, forecast in score_forecast_jobs([(s, frame) for s in rest]):
+            if forecast is not None:
+                forecasts[sku_id] = forecast["yhat"]
+    return forecasts
+
+
+# ================================================================
+# FORECAST RISK
+# ================================================================
+def model_artifact_signature():
+    """(file name, mtime) of every model artifact in MODEL_DIR; () when it is missing.
+
+    A directory's own mtime misses artifacts overwritten in place, so cached
+    forecasts are keyed on the files themselves.
+    """
+    from compact_model import COMPACT_SUFFIX
+
+    try:
+        with os.scandir(current_app.config["MODEL_DIR"]) as it:
+            return tuple(sorted(
+                (entry.name, entry.stat().st_mtime)
+                for entry in it
+                if entry.name.endswith((".pkl", COMPACT_SUFFIX))
+            ))
+    except FileNotFoundError:
+        return ()
+
+
+@forecast.route("/api/forecast/stockout-risk", methods=["GET"])
+def get_stockout_risk():
+    try:
+        horizon = int(request.args.get("horizon", "7"))
+        temp = float(request.args.get("temp", "25"))
+        rain = float(request.args.get("rain", "0"))
+        holiday = int(request.args.get("holiday", "0"))
+    except ValueError:
+        return jsonify({"error": "Invalid horizon, temp, rain or holiday"}), 400
+    if not 1 <= horizon <= 90:
+        return jsonify({"error": "horizon must be between 1 and 90 days"}), 400
+
+    today = date.today()
+    versions = get_table_versions()
+    key = ("stockout-risk", today, horizon, temp, rain, holiday, model_artifact_signature())
+    payload = derived_cache.get_or_compute(
+        key,
+        (versions.get("inventory"), versions.get("transaction")),
+        lambda: compute_stockout_risk(today, horizon, temp, rain, holiday),
+    )
+    return jsonify(payload), 200
+
+
+def compute_stockout_risk(start, horizon, temp, rain, holiday):
+    """Join live stock with forecast demand summed over ``horizon`` days."""
+    items = (
+        Inventory.query.with_entities(
+            Inventory.id, Inventory.sku_id, Inventory.name, Inventory.category, Inventory.quantity
+        )
+        .filter(Inventory.status != "deleted", Inventory.sku_id.isnot(None), Inventory.sku_id != "")
+        .all()
+    )
+    dates = [datetime.combine(start + timedelta(days=i), datetime.min.time()) for i in range(horizon)]
+    forecasts = forecast_catalog(dates, temp, rain, holiday, sku_ids=sorted({i.sku_id for i in items}))
+
+    rows, missing = [], []
+    counts = {"stockout": 0, "overstock": 0, "healthy": 0}
+    for item in items:
+        yhat = forecasts.get(item.sku_id)
+        if yhat is None:
+            missing.append(item.sku_id)
+            continue
+        demand = round(sum(max(0.0, y) for y in yhat), 2)
+        gap = round(demand - item.quantity, 2)
+        if demand > item.quantity:
+            status = "stockout"
+        elif item.quantity > demand * 2:
+            status = "overstock"
+        else:
+            status = "healthy"
+        counts[status] += 1
+        rows.append({
+            "id": str(item.id),
+            "sku_id": item.sku_id,
+            "name": item.name,
+            "category": item.category,
+            "currentStock": item.quantity,
+            "predictedDemand": demand,
+            "gap": gap,
+            "reorderQty": math.ceil(gap) if gap > 0 else 0,
+            "status": status,
+        })
+
+    rows.sort(key=lambda r: r["gap"], reverse=True)
+    counts["missingModel"] = len(missing)
+    return {
+        "from": start.isoformat(),
+        "horizon": horizon,
+        "items": rows,
+        "counts": counts,
+        "missingModels": sorted(missing),
+    }
+
+
+# ----------------------------------------------------------------
+# WARM-UP
+# ----------------------------------------------------------------
+def select_warmup_skus():
+    """Configured SKUs, else top-N by recent sales padded with other models."""
+    if current_app.config["FORECAST_WARMUP_SKUS"]:
+        return current_app.config["FORECAST_WARMUP_SKUS"]
+    top_n = current_app.config["FORECAST_WARMUP_TOP_N"]
+    skus = top_skus_by_volume(db, Inventory, Transaction, top_n)
+    if len(skus) < top_n:
+        registry = get_model_registry()
+        chosen = set(skus)
+        for f in sorted(os.listdir(registry.model_dir)):
+            if len(skus) >= top_n:
+                break
+            sku_id = f[: -len(registry.suffix)]
+            if f.endswith(registry.suffix) and sku_id not in chosen:
+                skus.append(sku_id)
+    return skus
+
+
+def warm_forecasting():
+    # Pay for the lazy imports here rather than on the first request
+    import pandas  # noqa: F401
+
+    if current_app.config["MODEL_COMPACT"]:
+        get_forecast_engines().get()
+
+
+def start_warmup(app):
+    """Preload models on a background thread; /healthz/ready waits for it."""
+    with app.app_context():
+        registry = get_model_registry()
+    warmup.start(app, select_warmup_skus, registry.get, prepare=warm_forecasting)
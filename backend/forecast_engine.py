@@ -0,0 +1,169 @@
+"""
+backend/forecast_engine.py
+
+Vectorized forecasting across the whole catalog.
+
+Every compact model (see compact_model.py) is a handful of parameters, so
+the whole catalog stacks into a few NumPy arrays: one row per SKU, padded
+where models differ in changepoint count or Fourier order. Trend,
+seasonality and regressor terms are then evaluated as broadcasted
+(SKU × date) matrix operations instead of one ``model.predict`` per SKU.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from compact_model import COMPACT_SUFFIX, CompactProphet, to_days
+
+
+class ForecastEngine:
+    """Stacked parameters for many compact models, scored together."""
+
+    def __init__(self, models: Mapping[str, CompactProphet]) -> None:
+        self.sku_ids = sorted(models)
+        self.index = {sku_id: i for i, sku_id in enumerate(self.sku_ids)}
+        ordered = [models[s] for s in self.sku_ids]
+        n = len(ordered)
+
+        def stack(attr: str) -> np.ndarray:
+            return np.array([getattr(m, attr) for m in ordered], dtype=np.float64)
+
+        self.start = stack("start")
+        self.t_scale = stack("t_scale")
+        self.k = stack("k")
+        self.m = stack("m")
+        self.y_scale = stack("y_scale")
+        self.floor = stack("floor")
+        self.flat = np.array([m.growth == 1 for m in ordered], dtype=bool)
+
+        # Changepoints padded with (t=0, delta=0), which contribute nothing
+        n_cp = max((m.changepoints_t.shape[0] for m in ordered), default=0)
+        self.changepoints_t = np.zeros((n, n_cp))
+        self.delta = np.zeros((n, n_cp))
+        for i, m in enumerate(ordered):
+            c = m.changepoints_t.shape[0]
+            self.changepoints_t[i, :c] = m.changepoints_t
+            self.delta[i, :c] = m.delta
+
+        # name -> (period[S], sin betas[S, N], cos betas[S, N], multiplicative[S])
+        self.seasonalities: dict[str, tuple[np.ndarray, ...]] = {}
+        names = sorted({name for m in ordered for name in m.seasonalities})
+        for name in names:
+            order = max(m.seasonalities[name][2].shape[0] // 2 for m in ordered if name in m.seasonalities)
+            period = np.ones(n)
+            b_sin = np.zeros((n, order))
+            b_cos = np.zeros((n, order))
+            mult = np.zeros(n, dtype=bool)
+            for i, m in enumerate(ordered):
+                if name not in m.seasonalities:
+                    continue
+                p, is_mult, betas = m.seasonalities[name]
+                period[i] = p
+                b_sin[i, : betas.shape[0] // 2] = betas[0::2]
+                b_cos[i, : betas.shape[0] // 2] = betas[1::2]
+                mult[i] = is_mult
+            self.seasonalities[name] = (period, b_sin, b_cos, mult)
+
+        # name -> (mu[S], std[S], beta[S], multiplicative[S]); absent => beta 0
+        self.regressors: dict[str, tuple[np.ndarray, ...]] = {}
+        for name in sorted({name for m in ordered for name in m.regressors}):
+            params = np.array(
+                [m.regressors.get(name, (0.0, 1.0, 0.0, False)) for m in ordered], dtype=np.float64
+            )
+            self.regressors[name] = (params[:, 0], params[:, 1], params[:, 2], params[:, 3].astype(bool))
+
+    def __len__(self) -> int:
+        return len(self.sku_ids)
+
+    def __contains__(self, sku_id: str) -> bool:
+        return sku_id in self.index
+
+    @classmethod
+    def from_dir(cls, model_dir: str) -> "ForecastEngine":
+        """Stack every compact artifact that is at least as new as its pickle."""
+        models = {}
+        for sku_id, _ in _compact_signature(model_dir):
+            models[sku_id] = CompactProphet.load(os.path.join(model_dir, sku_id + COMPACT_SUFFIX))
+        return cls(models)
+
+    def predict(
+        self,
+        ds: Any,
+        regressors: Mapping[str, Any],
+        sku_ids: Sequence[str] | None = None,
+    ) -> np.ndarray:
+        """Return yhat with shape (len(sku_ids), len(ds)).
+
+        Regressor values may be scalars, per-date arrays (D,) or per-SKU,
+        per-date arrays (S, D). ``sku_ids`` defaults to every stacked SKU.
+        """
+        rows = slice(None) if sku_ids is None else np.array([self.index[s] for s in sku_ids], dtype=np.intp)
+        days = to_days(ds)
+
+        # Trend: piecewise linear (or flat) per SKU, (S, D)
+        t = (days[None, :] - self.start[rows, None]) / self.t_scale[rows, None]
+        cp = self.changepoints_t[rows]
+        deltas_t = (cp[:, None, :] <= t[:, :, None]) * self.delta[rows][:, None, :]
+        k_t = deltas_t.sum(axis=2) + self.k[rows, None]
+        m_t = (deltas_t * -cp[:, None, :]).sum(axis=2) + self.m[rows, None]
+        trend = np.where(self.flat[rows, None], self.m[rows, None], k_t * t + m_t)
+        trend = trend * self.y_scale[rows, None] + self.floor[rows, None]
+
+        additive = np.zeros_like(t)
+        multiplicative = np.zeros_like(t)
+        for period, b_sin, b_cos, mult in self.seasonalities.values():
+            orders = np.arange(1, b_sin.shape[1] + 1)
+            x = 2 * np.pi * days[None, :, None] * orders[None, None, :] / period[rows, None, None]
+            comp = np.einsum("sdn,sn->sd", np.sin(x), b_sin[rows]) + np.einsum("sdn,sn->sd", np.cos(x), b_cos[rows])
+            additive += np.where(mult[rows, None], 0.0, comp)
+            multiplicative += np.where(mult[rows, None], comp, 0.0)
+        for name, (mu, std, beta, mult) in self.regressors.items():
+            if name not in regressors:
+                raise ValueError(f"Regressor {name!r} missing")
+            values = np.broadcast_to(np.asarray(regressors[name], dtype=np.float64), t.shape)
+            comp = (values - mu[rows, None]) / std[rows, None] * beta[rows, None]
+            additive += np.where(mult[rows, None], 0.0, comp)
+            multiplicative += np.where(mult[rows, None], comp, 0.0)
+
+        return trend * (1 + multiplicative) + additive * self.y_scale[rows, None]
+
+
+def _compact_signature(model_dir: str) -> list[tuple[str, float]]:
+    """(sku_id, mtime) of every compact artifact not older than its pickle; [] without a model dir."""
+    mtimes = {}
+    try:
+        with os.scandir(model_dir) as it:
+            for entry in it:
+                stem, ext = os.path.splitext(entry.name)
+                if ext in (".pkl", COMPACT_SUFFIX):
+                    mtimes[(stem, ext)] = entry.stat().st_mtime
+    except FileNotFoundError:
+        return []
+    return sorted(
+        (stem, mtime)
+        for (stem, ext), mtime in mtimes.items()
+        if ext == COMPACT_SUFFIX and mtime >= mtimes.get((stem, ".pkl"), 0.0)
+    )
+
+
+class EngineCache:
+    """Holds one ForecastEngine per model directory, rebuilt when artifacts change."""
+
+    def __init__(self, model_dir: str) -> None:
+        self.model_dir = model_dir
+        self._engine: ForecastEngine | None = None
+        self._signature: list[tuple[str, float]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ForecastEngine:
+        signature = _compact_signature(self.model_dir)
+        with self._lock:
+            if self._engine is None or signature != self._signature:
+                self._engine = ForecastEngine.from_dir(self.model_dir)
+                self._signature = signature
+            return self._engine
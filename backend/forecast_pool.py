@@ -0,0 +1,128 @@
+"""
+backend/forecast_pool.py
+
+SKU-level forecast jobs, run either in-process or on a process pool.
+
+Prophet's ``predict`` is CPU-bound and holds the GIL, so scoring many SKUs
+from one Flask worker only ever uses one core. ``ForecastPool`` ships each
+SKU's frame to a worker process; every worker keeps its own warm
+``ModelRegistry`` and results are yielded as soon as each SKU finishes.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Iterable, Iterator, Optional
+
+import joblib
+import pandas as pd
+
+from compact_model import CompactProphet, load_model
+from model_registry import ModelRegistry
+
+FORECAST_COLUMNS = ("yhat", "yhat_lower", "yhat_upper")
+
+# A job is (sku_id, frame) where frame maps ds/temp_c/rain_mm/is_holiday to
+# equal-length lists; a result is {column: [float, ...]} row-aligned with the
+# frame, or None when the SKU has no model.
+Job = tuple[str, dict[str, list]]
+Result = Optional[dict[str, list[float]]]
+
+
+def score_frame(model: Any, frame: dict[str, list]) -> dict[str, list[float]]:
+    """Score every row of ``frame`` with ``model`` in one ``predict`` call."""
+    if isinstance(model, CompactProphet):
+        return model.predict_frame(frame)
+    input_df = pd.DataFrame(frame)
+    # Prophet returns rows stably sorted by ds; map them back to input order
+    order = input_df["ds"].argsort(kind="mergesort").to_numpy()
+    forecast = model.predict(input_df)[list(FORECAST_COLUMNS)]
+    forecast.index = order
+    forecast = forecast.sort_index()
+    return {col: forecast[col].astype(float).tolist() for col in FORECAST_COLUMNS}
+
+
+def score_jobs(registry: ModelRegistry, jobs: Iterable[Job]) -> Iterator[tuple[str, Result]]:
+    """Serial fallback: score jobs one after another in this process."""
+    for sku_id, frame in jobs:
+        model = registry.get(sku_id)
+        yield sku_id, (score_frame(model, frame) if model is not None else None)
+
+
+# ---------------------------------------------------------------------------
+# Worker-process side
+# ---------------------------------------------------------------------------
+_worker_registry: ModelRegistry | None = None
+
+
+def _init_worker(model_dir: str, max_models: int, max_bytes: int, compact: bool) -> None:
+    global _worker_registry
+    _worker_registry = ModelRegistry(
+        model_dir,
+        loader=load_model if compact else joblib.load,
+        max_models=max_models,
+        max_bytes=max_bytes,
+    )
+
+
+def _run_job(sku_id: str, frame: dict[str, list]) -> tuple[str, Result]:
+    return next(score_jobs(_worker_registry, [(sku_id, frame)]))
+
+
+# ---------------------------------------------------------------------------
+# Parent-process side
+# ---------------------------------------------------------------------------
+class ForecastPool:
+    """Lazily started process pool for SKU-level forecast jobs."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        workers: int,
+        *,
+        max_models: int = 256,
+        max_bytes: int = 0,
+        compact: bool = True,
+    ) -> None:
+        self.model_dir = model_dir
+        self.workers = workers
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.compact = compact
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn, not fork: children must not inherit locks held by
+                    # request threads (model registry, SQLAlchemy pool) mid-request
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(self.model_dir, self.max_models, self.max_bytes, self.compact),
+                    )
+                executor = self._executor
+        return executor
+
+    def score(self, jobs: Iterable[Job]) -> Iterator[tuple[str, Result]]:
+        """Submit every job and yield ``(sku_id, result)`` as each finishes."""
+        executor = self._get_executor()
+        futures = [executor.submit(_run_job, sku_id, frame) for sku_id, frame in jobs]
+        try:
+            for fut in as_completed(futures):
+                yield fut.result()
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
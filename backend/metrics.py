@@ -0,0 +1,381 @@
+"""
+backend/metrics.py
+
+Request, SQL and forecasting instrumentation, without extra dependencies.
+
+``install_instrumentation`` hooks a Flask app and its SQLAlchemy engine:
+
+* every request is timed into ``http_request_duration_seconds`` (per route
+  template, so ``/api/inventory/<int:item_id>`` is one series) and counted
+  with its status;
+* every statement is timed into ``db_query_duration_seconds``, and the
+  number of queries per request goes into ``http_request_db_queries``, the
+  series that makes N+1 loops stand out;
+* sections wrapped in ``timed()`` (model load, predict) get their own
+  histograms.
+
+``render()`` produces the Prometheus text format for ``GET /metrics``, and
+responses carry a ``Server-Timing`` header with the same breakdown for the
+current request. Streamed responses (exports, event streams) are measured
+until their body is closed, and have no Server-Timing header. Metrics live in process memory, so each worker process
+reports its own.
+
+With ``slow_ms`` set, a sampling profiler records the stacks of in-flight
+requests and writes those slower than that to ``profile_dir`` as folded
+stacks (``frame;frame;frame count``), ready for flamegraph.pl or
+speedscope.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SQL_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """Cumulative buckets plus sum and count per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (math.inf,)
+        # labels -> [count per bucket (non-cumulative)..., sum]
+        self._series: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: Any) -> None:
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        names = self.labelnames + ("le",)
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(values[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Registry:
+    """Metrics plus collectors that report values owned elsewhere at scrape time.
+
+    A collector returns ``(name, kind, documentation, [(labels dict, value)])``
+    tuples.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[tuple]]] = []
+
+    def counter(self, *args: Any, **kwargs: Any) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args: Any, **kwargs: Any) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterable[tuple]]) -> Callable[[], Iterable[tuple]]:
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collect in self._collectors:
+            for name, kind, documentation, samples in collect():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    names = tuple(labels)
+                    lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time to produce a response, by route", ("method", "route")
+)
+REQUESTS = registry.counter("http_requests_total", "Responses sent, by route and status", ("method", "route", "status"))
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries", "SQL statements executed per request, by route", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by statement type", ("statement",),
+    buckets=QUERY_BUCKETS,
+)
+MODEL_LOAD_SECONDS = registry.histogram(
+    "forecast_model_load_seconds", "Time to deserialize a forecasting model on a registry miss"
+)
+PREDICT_SECONDS = registry.histogram("forecast_predict_seconds", "Time in model predict for /predict")
+
+
+# ----------------------------------------------------------------
+# Per-request tally (one request per thread at a time)
+# ----------------------------------------------------------------
+_current = threading.local()
+
+
+def _tally() -> dict | None:
+    return getattr(_current, "tally", None)
+
+
+@contextmanager
+def timed(histogram: Histogram, timing: str) -> Iterator[None]:
+    """Observe the block's duration, and add it to Server-Timing as ``timing``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed)
+        tally = _tally()
+        if tally is not None:
+            tally["timings"][timing] = tally["timings"].get(timing, 0.0) + elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    QUERY_SECONDS.observe(elapsed, verb if verb in SQL_VERBS else "OTHER")
+    tally = _tally()
+    if tally is not None:
+        tally["queries"] += 1
+        tally["query_seconds"] += elapsed
+
+
+def _handle_error(context):
+    # after_cursor_execute never runs for a failed statement
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def server_timing(tally: dict, total: float) -> str:
+    queries = tally["queries"]
+    parts = [f'db;dur={tally["query_seconds"] * 1e3:.2f};desc="{queries} quer{"y" if queries == 1 else "ies"}"']
+    parts += [f"{name};dur={seconds * 1e3:.2f}" for name, seconds in tally["timings"].items()]
+    parts.append(f"app;dur={total * 1e3:.2f}")
+    return ", ".join(parts)
+
+
+# ----------------------------------------------------------------
+# Slow-request sampling profiler
+# ----------------------------------------------------------------
+class SlowRequestProfiler:
+    """Samples the stacks of threads serving requests; keeps the slow ones.
+
+    The sampler thread only wakes while at least one request is in flight.
+    """
+
+    def __init__(self, profile_dir: str, slow_seconds: float, interval: float) -> None:
+        self.profile_dir = profile_dir
+        self.slow_seconds = slow_seconds
+        self.interval = interval
+        self._active: dict[int, StackCounter] = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._active[threading.get_ident()] = StackCounter()
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, elapsed: float, label: str) -> str | None:
+        """End this thread's sampling; returns the file written, if it was slow."""
+        with self._lock:
+            stacks = self._active.pop(threading.get_ident(), None)
+        if not stacks or elapsed < self.slow_seconds:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        safe = "".join(c if c.isalnum() else "_" for c in label).strip("_")
+        path = os.path.join(self.profile_dir, f"{time.strftime('%Y%m%dT%H%M%S')}-{elapsed * 1e3:.0f}ms-{safe}.folded")
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+        return path
+
+    def _sample(self) -> None:
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._active:
+                    self._busy.clear()
+                    continue
+                for ident, stacks in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[_fold(frame)] += 1
+
+
+def _fold(frame: Any) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+# ----------------------------------------------------------------
+# Flask / SQLAlchemy wiring
+# ----------------------------------------------------------------
+def install_instrumentation(
+    app: Any,
+    engine: Any,
+    *,
+    server_timing_header: bool = True,
+    slow_ms: float = 0,
+    sample_ms: float = 5,
+    profile_dir: str = "profiles",
+) -> SlowRequestProfiler | None:
+    """Time every request of ``app`` and every statement on ``engine``."""
+    from flask import request
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    profiler = SlowRequestProfiler(profile_dir, slow_ms / 1e3, sample_ms / 1e3) if slow_ms > 0 else None
+
+    @app.before_request
+    def start_request_timer():
+        _current.tally = {"started": time.perf_counter(), "queries": 0, "query_seconds": 0.0, "timings": {}}
+        if profiler is not None:
+            profiler.start()
+
+    def finish_request(tally, method, route, status, response=None):
+        elapsed = time.perf_counter() - tally["started"]
+        REQUEST_SECONDS.observe(elapsed, method, route)
+        REQUESTS.inc(method, route, status)
+        REQUEST_QUERIES.observe(tally["queries"], method, route)
+        if response is not None and server_timing_header:
+            response.headers["Server-Timing"] = server_timing(tally, elapsed)
+        if profiler is not None:
+            path = profiler.stop(elapsed, f"{method} {route}")
+            if path is not None:
+                app.logger.warning("Slow request %s %s (%.0f ms), stacks in %s", method, route, elapsed * 1e3, path)
+
+    @app.after_request
+    def record_request(response):
+        tally = _tally()
+        if tally is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        if not response.is_streamed:
+            finish_request(tally, request.method, route, response.status_code, response)
+            return response
+
+        # A streamed body runs its queries after this hook, so the request is
+        # measured until the server closes the response; its headers are
+        # already gone by then, so it carries no Server-Timing
+        tally["streamed"] = True
+        if profiler is not None and response.mimetype == "text/event-stream":
+            # An event stream lasts as long as its client: never a slow request
+            profiler.stop(0.0, "")
+
+        def finish_stream(method=request.method, status=response.status_code):
+            finish_request(tally, method, route, status)
+            if _tally() is tally:
+                _current.tally = None
+
+        response.call_on_close(finish_stream)
+        return response
+
+    @app.teardown_request
+    def end_request_timer(exc):
+        # Streamed responses end their tally when closed (see record_request)
+        tally = _tally()
+        if tally is not None and tally.get("streamed"):
+            return
+        # Requests that failed before after_request still end their tally
+        _current.tally = None
+        if profiler is not None:
+            profiler.stop(0.0, "")
+
+    return profiler
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,133 @@
+"""
+backend/model_registry.py
+
+In-process cache of loaded forecasting models.
+
+Models live on disk as ``<model_dir>/<sku_id>.pkl``. The registry keeps the
+most recently used ones in memory, bounded both by count and by (on-disk)
+size, and reloads a model when its file's mtime changes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class _Entry:
+    __slots__ = ("model", "mtime", "size")
+
+    def __init__(self, model: Any, mtime: float, size: int) -> None:
+        self.model = model
+        self.mtime = mtime
+        self.size = size
+
+
+class ModelRegistry:
+    """LRU cache of models keyed by SKU id.
+
+    ``max_models`` / ``max_bytes`` of 0 disable that bound. Byte accounting
+    uses the artifact's file size as a proxy for its in-memory footprint.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        loader: Callable[[str], Any],
+        *,
+        max_models: int = 256,
+        max_bytes: int = 0,
+        suffix: str = ".pkl",
+    ) -> None:
+        self.model_dir = model_dir
+        self.loader = loader
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "reloads": 0}
+
+    def path_for(self, sku_id: str) -> str:
+        return os.path.join(self.model_dir, f"{sku_id}{self.suffix}")
+
+    def get(self, sku_id: str) -> Any | None:
+        """Return the model for ``sku_id``, loading it on a miss.
+
+        Returns None when no artifact exists for the SKU.
+        """
+        if not sku_id or os.path.basename(sku_id) != sku_id:
+            return None
+        path = self.path_for(sku_id)
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            self._drop(sku_id)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(sku_id)
+            if entry is not None and entry.mtime == st.st_mtime:
+                self._entries.move_to_end(sku_id)
+                self._counters["hits"] += 1
+                return entry.model
+            if entry is not None:
+                self._counters["reloads"] += 1
+            self._counters["misses"] += 1
+
+        # Deserialize outside the lock so one slow load doesn't stall hits
+        model = self.loader(path)
+
+        with self._lock:
+            self._remove_locked(sku_id)
+            self._entries[sku_id] = _Entry(model, st.st_mtime, st.st_size)
+            self._bytes += st.st_size
+            self._evict_locked()
+        return model
+
+    def __contains__(self, sku_id: str) -> bool:
+        with self._lock:
+            return sku_id in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "models": len(self._entries),
+                "bytes": self._bytes,
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+            }
+
+    # ------------------------------------------------------------------
+    # internals (*_locked helpers expect self._lock to be held)
+    # ------------------------------------------------------------------
+    def _drop(self, sku_id: str) -> None:
+        with self._lock:
+            self._remove_locked(sku_id)
+
+    def _remove_locked(self, sku_id: str) -> None:
+        entry = self._entries.pop(sku_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict_locked(self) -> None:
+        # Always keep the entry just inserted, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            (self.max_models and len(self._entries) > self.max_models)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._counters["evictions"] += 1
@@ -1,8 +1,18 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import hashlib
+import logging
+import random
+import time
 
 db = SQLAlchemy()
+logger = logging.getLogger(__name__)
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -45,22 +55,70 @@ class Inventory(db.Model):
     status = db.Column(db.String(20), nullable=False, default="active")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Fingerprint of the import row last applied (see content_hash_of); any
+    # other write clears it, so the next import applies its row again
+    content_hash = db.Column(db.String(32), nullable=True)
+
+    # Columns covered by content_hash
+    CONTENT_FIELDS = ("sku_id", "name", "category", "price", "quantity", "expiry", "description", "status")
+
+    # to_dict() key -> formatter for the column of the same name; GET
+    # /api/inventory?fields= selects and serializes a subset of these
+    FIELDS = {
+        "id": str,
+        "sku_id": lambda v: v or "",
+        "name": lambda v: v,
+        "expiry": lambda v: v.isoformat() if v else None,
+        "quantity": lambda v: v,
+        "category": lambda v: v,
+        "price": lambda v: v,
+        "description": lambda v: v or "",
+        "status": lambda v: v,
+    }
+
+    @classmethod
+    def project(cls, row, fields, formatters=None):
+        """``to_dict`` limited to ``fields``, for an instance or a ``with_entities`` row.
+
+        ``formatters`` replaces FIELDS for routes with another row shape.
+        """
+        formatters = formatters or cls.FIELDS
+        return {f: formatters[f](getattr(row, f)) for f in fields}
 
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "sku_id": self.sku_id or "",
-            "name": self.name,
-            "expiry": self.expiry.isoformat() if self.expiry else None,
-            "quantity": self.quantity,
-            "category": self.category,
-            "price": self.price,
-            "description": self.description or "",
-            "status": self.status,
-        }
+        return self.project(self, self.FIELDS)
+
+    @classmethod
+    def content_hash_of(cls, values):
+        """Stable digest of ``values[f]`` for each of CONTENT_FIELDS."""
+        parts = []
+        for field in cls.CONTENT_FIELDS:
+            value = values.get(field)
+            parts.append("" if value is None else value.isoformat() if hasattr(value, "isoformat") else repr(value))
+        return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+# Case-insensitive lookups compare db.func.lower(col) == value.lower() (upper()
+# for SKUs); these expression indexes match that form exactly (SQLite >= 3.9,
+# Postgres)
+db.Index("ix_category_lower_name", db.func.lower(Category.name))
+db.Index("ix_inventory_lower_name", db.func.lower(Inventory.name))
+db.Index("ix_inventory_upper_sku_id", db.func.upper(Inventory.sku_id))
+db.Index("ix_inventory_lower_category", db.func.lower(Inventory.category))
+# Expiry radar buckets are expiry ranges read in (expiry, id) order
+db.Index("ix_inventory_expiry", Inventory.expiry)
 
 
 class Transaction(db.Model):
+    # Keyset pagination walks (time_of_transaction, id) newest first; the
+    # product and type filters lead their own index so filtered pages are
+    # still read in order without a sort
+    __table_args__ = (
+        db.Index("ix_transaction_time_id", "time_of_transaction", "id"),
+        db.Index("ix_transaction_product_time_id", "product_id", "time_of_transaction", "id"),
+        db.Index("ix_transaction_type_time_id", "transaction_type", "time_of_transaction", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, nullable=False)
     product_name = db.Column(db.String(120), nullable=False)
@@ -79,3 +137,255 @@ class Transaction(db.Model):
             "total_price": self.total_price,
             "time_of_transaction": self.time_of_transaction.isoformat(),
         }
+
+
+class DailySales(db.Model):
+    """Per-day rollup of transactions, maintained alongside every insert.
+
+    ``revenue`` sums ``Transaction.total_price`` as recorded, so purchase
+    rows carry negative amounts. Rebuild with scripts/backfill_daily_sales.py.
+    """
+
+    __tablename__ = "daily_sales"
+
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, primary_key=True)
+    transaction_type = db.Column(db.String(20), primary_key=True)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    transactions = db.Column(db.Integer, nullable=False, default=0)
+
+
+class MaterializedForecast(db.Model):
+    """Precomputed model output, filled by scripts/materialize_forecasts.py."""
+
+    __table_args__ = (
+        db.Index("ix_materialized_forecast_lookup", "sku_id", "ds", "temp", "rain", "holiday", unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    sku_id = db.Column(db.String(20), nullable=False)
+    ds = db.Column(db.Date, nullable=False)
+    temp = db.Column(db.Float, nullable=False)
+    rain = db.Column(db.Float, nullable=False)
+    holiday = db.Column(db.Integer, nullable=False)
+    yhat = db.Column(db.Float, nullable=False)
+    yhat_lower = db.Column(db.Float, nullable=True)
+    yhat_upper = db.Column(db.Float, nullable=True)
+    model_mtime = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TableVersion(db.Model):
+    """Monotonic per-table write counter, used for cache keys and ETags."""
+
+    name = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Tables whose writes invalidate cached reads, keyed by ORM class
+VERSIONED_TABLES = {Inventory: "inventory", Transaction: "transaction", Category: "category"}
+
+
+def bump_table_versions(session, names):
+    """Increment the write counter of each table in ``names`` within ``session``'s transaction.
+
+    For batch jobs: the bump commits atomically with their writes, but the
+    counter rows stay locked until then. Request handlers use
+    ``bump_table_versions_on_commit`` so concurrent writers do not queue on them.
+    """
+    _bump_counters(session.connection(), names)
+
+
+def bump_table_versions_on_commit(session, names):
+    """Increment the counters of ``names`` once ``session`` commits, in a transaction of their own.
+
+    The counter rows are then locked only for that short transaction, not
+    for the whole write. Between the two commits a reader can still see the
+    old version; a rollback drops the pending bump.
+    """
+    session.info.setdefault("pending_table_versions", set()).update(names)
+
+
+def _bump_counters(conn, names):
+    # Upsert, so two first writers cannot both insert the counter row
+    upsert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(conn.dialect.name)
+    if upsert is not None:
+        stmt = upsert(TableVersion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1},
+        )
+        for name in sorted(names):
+            conn.execute(stmt.values(name=name, version=1))
+        return
+
+    for name in sorted(names):
+        result = conn.execute(
+            db.update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            conn.execute(db.insert(TableVersion).values(name=name, version=1))
+
+
+def record_daily_sales(session, rows):
+    """Add transaction ``rows`` (column dicts) to the daily_sales rollup.
+
+    Runs in ``session``'s transaction, so the rollup commits or rolls back
+    with the rows it counts.
+    """
+    totals = {}
+    for row in rows:
+        key = (row["time_of_transaction"].date(), row["product_id"], row["transaction_type"])
+        units, revenue, count = totals.get(key, (0, 0.0, 0))
+        totals[key] = (units + row["product_quantity"], revenue + row["total_price"], count + 1)
+    if not totals:
+        return
+
+    conn = session.connection()
+    upsert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(conn.dialect.name)
+    if upsert is not None:
+        stmt = upsert(DailySales)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySales.day, DailySales.product_id, DailySales.transaction_type],
+            set_={
+                "units": DailySales.units + stmt.excluded.units,
+                "revenue": DailySales.revenue + stmt.excluded.revenue,
+                "transactions": DailySales.transactions + stmt.excluded.transactions,
+            },
+        )
+        conn.execute(stmt, [
+            {"day": day, "product_id": product_id, "transaction_type": kind,
+             "units": units, "revenue": revenue, "transactions": count}
+            for (day, product_id, kind), (units, revenue, count) in totals.items()
+        ])
+        return
+
+    for (day, product_id, kind), (units, revenue, count) in totals.items():
+        result = conn.execute(
+            db.update(DailySales)
+            .where(DailySales.day == day, DailySales.product_id == product_id, DailySales.transaction_type == kind)
+            .values(
+                units=DailySales.units + units,
+                revenue=DailySales.revenue + revenue,
+                transactions=DailySales.transactions + count,
+            )
+        )
+        if result.rowcount == 0:
+            conn.execute(db.insert(DailySales).values(
+                day=day, product_id=product_id, transaction_type=kind,
+                units=units, revenue=revenue, transactions=count,
+            ))
+
+
+def add_missing_columns():
+    """Add nullable model columns to tables created before the column existed.
+
+    ``db.create_all`` never alters existing tables.
+    """
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        preparer = conn.dialect.identifier_preparer
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                conn.execute(db.text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(conn.dialect)}"
+                ))
+
+
+def create_missing_indexes():
+    """Create indexes declared on models whose tables predate them.
+
+    ``db.create_all`` only emits CREATE INDEX for tables it creates itself.
+    """
+    # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run ``PRAGMA name = value`` for each of ``pragmas`` on every new SQLite connection.
+
+    No-op for other databases. WAL lets readers proceed while one writer
+    commits; busy_timeout makes writers wait for the lock instead of failing.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+# Driver messages for "another writer holds the lock, try again"
+_LOCK_ERRORS = ("database is locked", "database table is locked", "deadlock detected", "could not serialize")
+
+
+def retry_on_lock(work, attempts=5, backoff=0.02):
+    """Run ``work()`` (which commits), retrying on write-lock contention.
+
+    The session is rolled back before each retry; backoff is exponential
+    with jitter so competing writers do not retry in lockstep.
+    """
+    for attempt in range(attempts):
+        try:
+            return work()
+        except OperationalError as exc:
+            db.session.rollback()
+            if attempt == attempts - 1 or not any(m in str(exc.orig).lower() for m in _LOCK_ERRORS):
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def get_table_versions():
+    rows = db.session.execute(db.select(TableVersion.name, TableVersion.version))
+    return {name: version for name, version in rows}
+
+
+@event.listens_for(Session, "before_flush")
+def _clear_stale_content_hashes(session, flush_context, instances):
+    for obj in session.dirty:
+        if isinstance(obj, Inventory) and session.is_modified(obj):
+            if not db.inspect(obj).attrs.content_hash.history.has_changes():
+                obj.content_hash = None
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions_on_flush(session, flush_context, instances):
+    changed = [*session.new, *session.deleted]
+    changed += [obj for obj in session.dirty if session.is_modified(obj)]
+    touched = {VERSIONED_TABLES[type(obj)] for obj in changed if type(obj) in VERSIONED_TABLES}
+    if touched:
+        bump_table_versions_on_commit(session, touched)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_pending_versions(session):
+    names = session.info.pop("pending_table_versions", None)
+    if not names:
+        return
+    # The data is already committed: a failed bump leaves caches stale until
+    # the next write, which beats failing a request that succeeded
+    try:
+        with session.get_bind().begin() as conn:
+            _bump_counters(conn, names)
+    except OperationalError:
+        logger.exception("Could not bump table versions %s", sorted(names))
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_versions(session):
+    session.info.pop("pending_table_versions", None)
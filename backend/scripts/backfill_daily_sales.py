@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/backfill_daily_sales.py
+
+Rebuild the daily_sales rollup from the transaction history.
+
+The API keeps daily_sales current as transactions are written; run this
+once after upgrading (to cover history recorded before the rollup existed)
+or after editing transactions directly in the database. Days in the range
+are deleted and re-aggregated in one DB transaction.
+
+Usage:
+    python backend/scripts/backfill_daily_sales.py
+    python backend/scripts/backfill_daily_sales.py --start 2024-01-01 --end 2024-12-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app import app                                    # noqa: E402
+from models import db, DailySales, Transaction, bump_table_versions  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Core backfill logic
+# ---------------------------------------------------------------------------
+def run_backfill(*, start=None, end=None) -> None:
+    started = time.perf_counter()
+
+    day = db.func.date(Transaction.time_of_transaction)
+    source = db.select(
+        day,
+        Transaction.product_id,
+        Transaction.transaction_type,
+        db.func.sum(Transaction.product_quantity),
+        db.func.sum(Transaction.total_price),
+        db.func.count(Transaction.id),
+    ).group_by(day, Transaction.product_id, Transaction.transaction_type)
+    target = db.delete(DailySales)
+    if start is not None:
+        source = source.where(Transaction.time_of_transaction >= start)
+        target = target.where(DailySales.day >= start)
+    if end is not None:
+        source = source.where(Transaction.time_of_transaction < end + timedelta(days=1))
+        target = target.where(DailySales.day <= end)
+
+    deleted = db.session.execute(target).rowcount
+    inserted = db.session.execute(
+        db.insert(DailySales).from_select(
+            ["day", "product_id", "transaction_type", "units", "revenue", "transactions"], source
+        )
+    ).rowcount
+    bump_table_versions(db.session, {"daily_sales"})
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  DAILY SALES BACKFILL SUMMARY")
+    print("=" * 55)
+    print(f"  Range               : {start or 'beginning'} .. {end or 'latest'}")
+    print(f"  Rollup rows removed : {deleted}")
+    print(f"  Rollup rows written : {inserted}")
+    print(f"  Elapsed             : {elapsed:.2f}s")
+    print("=" * 55)
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the daily_sales rollup from transactions.")
+    parser.add_argument("--start", help="First day to rebuild, YYYY-MM-DD (default: all history)")
+    parser.add_argument("--end", help="Last day to rebuild, YYYY-MM-DD (default: all history)")
+    args = parser.parse_args()
+
+    try:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else None
+        end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else None
+    except ValueError as exc:
+        print(f"[error] {exc}")
+        sys.exit(1)
+    if start and end and end < start:
+        print("[error] --end must not be before --start")
+        sys.exit(1)
+
+    with app.app_context():
+        db.create_all()
+        run_backfill(start=start, end=end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/bench_db_profile.py
+
+Mixed read/write load against SQLite under each database profile.
+
+For every profile a fresh SQLite file is seeded, then several worker
+processes hammer the real Flask app for a fixed time: a share of requests
+are sales (POST /api/transactions), the rest are dashboard reads (an
+inventory page, a transactions page, the analytics overview). The script
+reports requests/sec, p50/p95/p99 latency for reads and writes, and how
+many requests failed with "database is locked" (503/500).
+
+With the default profile (rollback journal) readers and the writer block
+each other; DB_PROFILE=production (WAL, synchronous=NORMAL, busy_timeout)
+should show higher throughput and a much shorter tail.
+
+Usage:
+    python backend/scripts/bench_db_profile.py
+    python backend/scripts/bench_db_profile.py --workers 8 --seconds 10 --write-ratio 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+PROFILES = ("default", "production")
+READ_PATHS = (
+    "/api/inventory?limit=50",
+    "/api/transactions?limit=50",
+    "/api/analytics/overview?range=1m",
+)
+
+
+def worker_env(env: dict[str, str]) -> None:
+    """Pool initializer: config is read at import time, so set it first."""
+    os.environ.update(env)
+
+
+def seed(items: int) -> list[str]:
+    from app import app
+    from models import db, Inventory
+
+    with app.app_context():
+        db.session.execute(db.insert(Inventory), [
+            {
+                "name": f"Bench Item {i:05d}",
+                "quantity": 10 ** 9,
+                "category": f"Category {i % 12}",
+                "price": 1.0 + i % 50,
+                "status": "active",
+            }
+            for i in range(items)
+        ])
+        db.session.commit()
+    return [f"Bench Item {i:05d}" for i in range(items)]
+
+
+def client(args: tuple[float, float, list[str], int, multiprocessing.Barrier]) -> tuple[float, list]:
+    """Issue requests for ``seconds``; return (wall time, [(kind, status, latency)])."""
+    seconds, write_ratio, names, worker_seed, barrier = args
+    from flask_jwt_extended import create_access_token
+    from app import app
+
+    with app.app_context():
+        headers = {"Authorization": "Bearer " + create_access_token(identity="bench")}
+    rng = random.Random(worker_seed)
+    samples = []
+    with app.test_client() as http:
+        barrier.wait()
+        began = time.perf_counter()
+        deadline = began + seconds
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            if rng.random() < write_ratio:
+                kind = "write"
+                resp = http.post(
+                    "/api/transactions",
+                    json={"name": rng.choice(names), "quantity": 1, "transaction_type": "sale"},
+                    headers=headers,
+                )
+            else:
+                kind = "read"
+                resp = http.get(rng.choice(READ_PATHS), headers=headers)
+            samples.append((kind, resp.status_code, time.perf_counter() - started))
+        wall = time.perf_counter() - began
+    return wall, samples
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def run_profile(profile: str, args: argparse.Namespace, tmp: str) -> dict:
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, f'bench_{profile}.db')}",
+        "DB_PROFILE": profile,
+        "FORECAST_WARMUP": "false",
+    }
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Manager().Barrier(args.workers)
+    with ctx.Pool(args.workers, initializer=worker_env, initargs=(env,)) as pool:
+        names = pool.apply(seed, (args.items,))
+        jobs = [(args.seconds, args.write_ratio, names, i, barrier) for i in range(args.workers)]
+        results = pool.map(client, jobs)
+
+    # Measured from the barrier, so process start-up and imports are excluded
+    elapsed = max(wall for wall, _ in results)
+    samples = [s for _, worker in results for s in worker]
+    statuses = Counter(status for _, status, _ in samples)
+    stats = {"profile": profile, "elapsed": elapsed, "requests": len(samples), "statuses": statuses}
+    for kind in ("read", "write"):
+        ok = sorted(lat for k, status, lat in samples if k == kind and status < 500)
+        stats[kind] = {
+            "count": len(ok),
+            "p50": statistics.median(ok) if ok else 0.0,
+            "p95": percentile(ok, 95),
+            "p99": percentile(ok, 99),
+        }
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare SQLite database profiles under mixed load.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent client processes")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Load duration per profile")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of requests that are sales")
+    parser.add_argument("--items", type=int, default=500, help="Inventory rows to seed")
+    parser.add_argument("--profile", action="append", choices=PROFILES, help="Profile to run (repeatable; default: all)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [run_profile(profile, args, tmp) for profile in args.profile or PROFILES]
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  DB PROFILE BENCHMARK")
+    print("=" * 55)
+    print(f"  Workers × seconds   : {args.workers} × {args.seconds:g}s, {args.write_ratio:.0%} writes")
+    for run in runs:
+        errors = sum(n for status, n in run["statuses"].items() if status >= 500)
+        print(f"  [{run['profile']}]")
+        print(f"    Requests / sec    : {run['requests'] / run['elapsed']:.0f}")
+        for kind in ("read", "write"):
+            s = run[kind]
+            print(
+                f"    {kind.capitalize():<6} p50/p95/p99: {s['p50'] * 1e3:6.1f} / {s['p95'] * 1e3:6.1f} / "
+                f"{s['p99'] * 1e3:6.1f} ms ({s['count']} ok)"
+            )
+        print(f"    Failed (5xx)      : {errors}")
+    print("=" * 55)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/bench_name_lookup.py
+
+Benchmark the case-insensitive inventory lookup that every sale runs
+(``lower(name) = :name AND status != 'deleted'``) as the catalog grows.
+
+For each size a fresh SQLite database is filled with synthetic SKUs and the
+lookup is timed with the ``ix_inventory_lower_name`` expression index and,
+with --compare, again after dropping it. With the index the median should
+stay flat from 1k to 100k rows; without it, it grows linearly.
+
+Usage:
+    python backend/scripts/bench_name_lookup.py
+    python backend/scripts/bench_name_lookup.py --sizes 1000,10000,100000 --lookups 2000 --compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import bindparam, create_engine, func, insert, select, text  # noqa: E402
+
+from models import db, Inventory                       # noqa: E402
+
+INSERT_CHUNK = 10_000
+
+
+def build_db(path: str, size: int):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for start in range(0, size, INSERT_CHUNK):
+            conn.execute(insert(Inventory), [
+                {
+                    "name": f"Product {i:06d} Deluxe",
+                    "quantity": 100,
+                    "category": f"Category {i % 40}",
+                    "price": 1.0,
+                    "status": "active",
+                }
+                for i in range(start, min(size, start + INSERT_CHUNK))
+            ])
+    return engine
+
+
+def time_lookups(engine, size: int, lookups: int) -> float:
+    """Median seconds per lookup of a random existing name (mixed case)."""
+    stmt = (
+        select(Inventory.id)
+        .where(func.lower(Inventory.name) == bindparam("name"), Inventory.status != "deleted")
+        .limit(1)
+    )
+    rng = random.Random(0)
+    samples = []
+    with engine.connect() as conn:
+        for _ in range(lookups):
+            name = f"PRODUCT {rng.randrange(size):06d} deluxe".lower()
+            started = time.perf_counter()
+            if conn.execute(stmt, {"name": name}).first() is None:
+                raise RuntimeError(f"lookup for {name!r} found nothing")
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time case-insensitive name lookups as inventory grows.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated inventory sizes")
+    parser.add_argument("--lookups", type=int, default=1000, help="Lookups timed per size")
+    parser.add_argument("--compare", action="store_true", help="Also time each size without the index")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Fail if the indexed median at the largest size exceeds the smallest by this factor")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            engine = build_db(os.path.join(tmp, f"lookup_{size}.db"), size)
+            indexed = time_lookups(engine, size, args.lookups)
+            scan = None
+            if args.compare:
+                with engine.begin() as conn:
+                    conn.execute(text("DROP INDEX ix_inventory_lower_name"))
+                scan = time_lookups(engine, size, max(1, args.lookups // 10))
+            engine.dispose()
+            rows.append((size, indexed, scan))
+
+    growth = rows[-1][1] / rows[0][1] if rows else 1.0
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  NAME LOOKUP BENCHMARK (median per sale lookup)")
+    print("=" * 55)
+    for size, indexed, scan in rows:
+        line = f"  {size:>9,} SKUs    : {indexed * 1e6:8.1f} µs indexed"
+        if scan is not None:
+            line += f" | {scan * 1e6:9.1f} µs scan"
+        print(line)
+    print(f"  Growth (indexed)    : {growth:.2f}x from {rows[0][0]:,} to {rows[-1][0]:,} SKUs")
+    print("=" * 55)
+
+    if growth > args.max_growth:
+        print(f"[over budget] indexed lookup grew {growth:.2f}x (max {args.max_growth}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/bench_startup.py
+
+Cold-start benchmark for the inventory/transaction API.
+
+Each run starts a fresh interpreter that imports ``app`` and serves one
+GET /api/inventory through the test client, then reports import time,
+first-request time and peak RSS. Forecasting is loaded lazily (see
+forecast.py), so pandas, NumPy, Prophet and joblib must not show up in the
+child's ``sys.modules``; that and the time/memory budgets make the script
+exit 1, so it can gate CI.
+
+Usage:
+    python backend/scripts/bench_startup.py
+    python backend/scripts/bench_startup.py --runs 10 --max-seconds 1.5 --max-rss-mb 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+HEAVY_MODULES = ("pandas", "numpy", "prophet", "joblib", "cmdstanpy")
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = f"""
+import json, resource, sys, time
+started = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+with app.test_client() as client:
+    status = client.get("/api/inventory").status_code
+served = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - started,
+    "first_request_s": served - imported,
+    "status": status,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_probe(env: dict[str, str]) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API cold start and baseline memory.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start (default: 5)")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Budget for median import + first request")
+    parser.add_argument("--max-rss-mb", type=float, default=150.0, help="Budget for peak RSS of any run")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("FORECAST_WARMUP", "false")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Never touch the real database unless one is configured explicitly
+        env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench_startup.db')}")
+        samples = [run_probe(env) for _ in range(args.runs)]
+
+    startup = [s["import_s"] + s["first_request_s"] for s in samples]
+    summary = {
+        "runs": args.runs,
+        "import_s_median": round(statistics.median(s["import_s"] for s in samples), 4),
+        "first_request_s_median": round(statistics.median(s["first_request_s"] for s in samples), 4),
+        "startup_s_median": round(statistics.median(startup), 4),
+        "startup_s_max": round(max(startup), 4),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "max_rss_mb": round(
+            max(s["max_rss_kb"] for s in samples) / (1024 * 1024 if sys.platform == "darwin" else 1024), 1
+        ),
+        "heavy_modules": sorted({m for s in samples for m in s["heavy_modules"]}),
+        "statuses": sorted({s["status"] for s in samples}),
+    }
+
+    failures = []
+    if summary["startup_s_median"] > args.max_seconds:
+        failures.append(f"startup {summary['startup_s_median']}s > {args.max_seconds}s")
+    if summary["max_rss_mb"] > args.max_rss_mb:
+        failures.append(f"peak RSS {summary['max_rss_mb']} MB > {args.max_rss_mb} MB")
+    if summary["heavy_modules"]:
+        failures.append(f"forecasting imports loaded at startup: {', '.join(summary['heavy_modules'])}")
+    if summary["statuses"] != [200]:
+        failures.append(f"GET /api/inventory returned {summary['statuses']}")
+
+    if args.json:
+        print(json.dumps({**summary, "failures": failures}, indent=2))
+    else:
+        print("\n" + "=" * 55)
+        print("  STARTUP BENCHMARK")
+        print("=" * 55)
+        print(f"  Runs                : {summary['runs']}")
+        print(f"  Import (median)     : {summary['import_s_median'] * 1000:.0f} ms")
+        print(f"  First request       : {summary['first_request_s_median'] * 1000:.0f} ms")
+        print(f"  Startup (med / max) : {summary['startup_s_median']:.3f}s / {summary['startup_s_max']:.3f}s")
+        print(f"  Peak RSS            : {summary['max_rss_mb']} MB")
+        print(f"  Heavy modules       : {', '.join(summary['heavy_modules']) or 'none'}")
+        print("=" * 55)
+        for failure in failures:
+            print(f"[over budget] {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/bench_stock_contention.py
+
+Concurrency stress test for POST /api/transactions.
+
+Several worker processes ("tills") sell the same item one unit at a time
+through the real Flask app until the stock runs out, then the script checks
+the books: every 201 must have exactly one Transaction row, the remaining
+stock must equal initial stock minus units sold, and nothing may be
+oversold. It also reports sales/sec and how many requests hit the lock.
+
+Runs against a throwaway SQLite file unless DATABASE_URL is set.
+
+Usage:
+    python backend/scripts/bench_stock_contention.py
+    python backend/scripts/bench_stock_contention.py --workers 8 --stock 500 --attempts 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+ITEM_NAME = "Contention Test Item"
+
+
+def seed(stock: int) -> int:
+    from app import app
+    from models import db, Inventory, Transaction
+
+    with app.app_context():
+        db.create_all()
+        item = Inventory.query.filter_by(name=ITEM_NAME).first()
+        if item is None:
+            item = Inventory(name=ITEM_NAME, quantity=stock, category="Bench", price=1.0, status="active")
+            db.session.add(item)
+        item.quantity = stock
+        item.expiry = None
+        db.session.flush()
+        Transaction.query.filter_by(product_id=item.id).delete()
+        db.session.commit()
+        return item.id
+
+
+def till(args: tuple[int, int, multiprocessing.Barrier]) -> Counter:
+    """Sell one unit per request, ``attempts`` times; count status codes."""
+    attempts, quantity, barrier = args
+    from flask_jwt_extended import create_access_token
+    from app import app
+
+    with app.app_context():
+        headers = {"Authorization": "Bearer " + create_access_token(identity="bench")}
+    counts: Counter = Counter()
+    with app.test_client() as client:
+        barrier.wait()
+        for _ in range(attempts):
+            resp = client.post(
+                "/api/transactions",
+                json={"name": ITEM_NAME, "quantity": quantity, "transaction_type": "sale"},
+                headers=headers,
+            )
+            counts[resp.status_code] += 1
+    return counts
+
+
+def check_books(product_id: int, stock: int, quantity: int, sold: int) -> list[str]:
+    from app import app
+    from models import db, Inventory, Transaction
+
+    with app.app_context():
+        remaining = db.session.get(Inventory, product_id).quantity
+        rows, units = db.session.query(
+            db.func.count(Transaction.id), db.func.coalesce(db.func.sum(Transaction.product_quantity), 0)
+        ).filter(Transaction.product_id == product_id).one()
+
+    problems = []
+    if remaining < 0:
+        problems.append(f"oversold: stock is {remaining}")
+    if rows != sold:
+        problems.append(f"{sold} sales returned 201 but {rows} transaction rows exist")
+    if remaining != stock - units:
+        problems.append(f"lost update: stock {remaining} != {stock} - {units} units sold")
+    if units != sold * quantity:
+        problems.append(f"{units} units recorded for {sold} sales of {quantity}")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stress concurrent sales of one item.")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel tills (processes)")
+    parser.add_argument("--attempts", type=int, default=100, help="Sale requests per till")
+    parser.add_argument("--stock", type=int, default=300, help="Initial stock (less than workers × attempts to force sell-outs)")
+    parser.add_argument("--quantity", type=int, default=1, help="Units per sale")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench_contention.db')}")
+        os.environ.setdefault("FORECAST_WARMUP", "false")
+
+        product_id = seed(args.stock)
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Manager().Barrier(args.workers)
+        with ctx.Pool(args.workers) as pool:
+            started = time.perf_counter()
+            results = pool.map(till, [(args.attempts, args.quantity, barrier)] * args.workers)
+            elapsed = time.perf_counter() - started
+
+        counts = sum(results, Counter())
+        sold = counts[201]
+        problems = check_books(product_id, args.stock, args.quantity, sold)
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  STOCK CONTENTION SUMMARY")
+    print("=" * 55)
+    print(f"  Tills × attempts    : {args.workers} × {args.attempts}")
+    print(f"  Sold (201)          : {sold} of {args.stock // args.quantity} possible")
+    print(f"  Out of stock (400)  : {counts[400]}")
+    print(f"  Busy (503)          : {counts[503]}")
+    other = {code: n for code, n in counts.items() if code not in (201, 400, 503)}
+    if other:
+        print(f"  Other statuses      : {other}")
+    print(f"  Elapsed             : {elapsed:.2f}s")
+    print(f"  Requests / sec      : {sum(counts.values()) / elapsed:.0f}")
+    print(f"  Sales / sec         : {sold / elapsed:.0f}")
+    print(f"  Books balance       : {'yes' if not problems else 'NO'}")
+    print("=" * 55)
+    for problem in problems:
+        print(f"[error] {problem}")
+
+    sys.exit(1 if problems or other else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/convert_models.py
+
+Convert pickled Prophet models (<sku_id>.pkl) into compact, memory-mappable
+<sku_id>.npy artifacts next to them. The API prefers a compact artifact over
+the pickle whenever it is at least as new, so re-run this after retraining.
+
+Usage:
+    python backend/scripts/convert_models.py
+    python backend/scripts/convert_models.py --sku SKU0001 --verify
+    python backend/scripts/convert_models.py --model-dir /srv/models --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import joblib                                          # noqa: E402
+import numpy as np                                     # noqa: E402
+import pandas as pd                                    # noqa: E402
+
+from compact_model import CompactProphet, compact_path_for  # noqa: E402
+from config import Config                              # noqa: E402
+
+
+def verify(model, compact: CompactProphet, tolerance: float) -> float:
+    """Max |yhat| difference between Prophet and the compact model over a
+    spread of dates and regressor values. Raises if above ``tolerance``."""
+    rng = np.random.default_rng(0)
+    ds = pd.date_range(model.history["ds"].min(), periods=120, freq="11D")
+    frame = {"ds": ds}
+    for name in compact.regressors:
+        frame[name] = rng.uniform(0, 30, len(ds))
+    expected = model.predict(pd.DataFrame(frame))["yhat"].to_numpy()
+    actual = compact.predict(ds.values, frame, intervals=False)["yhat"]
+    err = float(np.abs(expected - actual).max())
+    if err > tolerance:
+        raise ValueError(f"yhat mismatch {err:.3g} exceeds tolerance {tolerance}")
+    return err
+
+
+def run_convert(
+    model_dir: str,
+    *,
+    skus: list[str] | None = None,
+    force: bool = False,
+    check: bool = False,
+    tolerance: float = 1e-6,
+) -> None:
+    if skus is None:
+        skus = sorted(f[:-4] for f in os.listdir(model_dir) if f.endswith(".pkl"))
+
+    stats = {"converted": 0, "up_to_date": 0, "failed": 0, "pkl_bytes": 0, "npy_bytes": 0}
+    started = time.perf_counter()
+    for sku_id in skus:
+        pkl = os.path.join(model_dir, f"{sku_id}.pkl")
+        npy = compact_path_for(pkl)
+        if not os.path.isfile(pkl):
+            print(f"  [skip] {sku_id}: {pkl} not found")
+            stats["failed"] += 1
+            continue
+        if not force and os.path.isfile(npy) and os.path.getmtime(npy) >= os.path.getmtime(pkl):
+            stats["up_to_date"] += 1
+            continue
+        try:
+            model = joblib.load(pkl)
+            compact = CompactProphet.from_prophet(model)
+            err = verify(model, compact, tolerance) if check else None
+        except ValueError as exc:
+            print(f"  [fail] {sku_id}: {exc}")
+            stats["failed"] += 1
+            continue
+        compact.save(npy)
+        stats["converted"] += 1
+        stats["pkl_bytes"] += os.path.getsize(pkl)
+        stats["npy_bytes"] += os.path.getsize(npy)
+        if err is not None:
+            print(f"  [ok] {sku_id}: max |Δyhat| = {err:.2e}")
+
+    elapsed = time.perf_counter() - started
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  CONVERT SUMMARY")
+    print("=" * 55)
+    print(f"  Converted           : {stats['converted']}")
+    print(f"  Already up to date  : {stats['up_to_date']}")
+    print(f"  Failed / skipped    : {stats['failed']}")
+    if stats["converted"]:
+        print(f"  Size (pkl → npy)    : {stats['pkl_bytes'] / 1e6:.1f} MB → {stats['npy_bytes'] / 1e6:.2f} MB")
+    print(f"  Elapsed             : {elapsed:.1f}s")
+    print("=" * 55)
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert pickled Prophet models into compact .npy artifacts."
+    )
+    parser.add_argument("--model-dir", default=Config.MODEL_DIR, help="Directory holding <sku_id>.pkl models")
+    parser.add_argument("--sku", action="append", help="Only this SKU (repeatable; default: all models)")
+    parser.add_argument("--force", action="store_true", help="Re-convert even if the artifact is up to date")
+    parser.add_argument("--verify", action="store_true", help="Check yhat against Prophet for each model")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Max allowed |Δyhat| with --verify")
+    args = parser.parse_args()
+
+    run_convert(args.model_dir, skus=args.sku, force=args.force, check=args.verify, tolerance=args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
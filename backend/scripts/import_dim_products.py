@@ -8,17 +8,32 @@ Usage:
     python backend/scripts/import_dim_products.py --csv /path/to/dim_products.csv
     python backend/scripts/import_dim_products.py --csv dim_products.csv --dry-run
     python backend/scripts/import_dim_products.py --csv dim_products.csv --limit 10 --verbose
+    python backend/scripts/import_dim_products.py --csv supplier_feed.csv --bulk --chunk-size 20000
+    python backend/scripts/import_dim_products.py --csv huge_feed.csv --stream --workers 4
+    python backend/scripts/import_dim_products.py --csv huge_feed.csv --stream --resume
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import itertools
+import json
+import multiprocessing
 import os
 import sys
+import time
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 # ---------------------------------------------------------------------------
 # Ensure the backend package is importable regardless of cwd
 # ---------------------------------------------------------------------------
@@ -30,8 +45,10 @@ PROJECT_DIR = BACKEND_DIR.parent                       # repo root
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from app import app                                    # noqa: E402
-from models import db, Inventory, Category             # noqa: E402
+from sqlalchemy.dialects import postgresql, sqlite     # noqa: E402
+
+from app import app, inventory_search                  # noqa: E402
+from models import db, Inventory, Category, bump_table_versions  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Column-name mapping (case-insensitive detection)
@@ -62,6 +79,7 @@ def resolve_columns(header: list[str]) -> dict[str, str | None]:
     return mapping
 
 
+@lru_cache(maxsize=4096)  # feeds repeat a handful of expiry dates
 def parse_date(val: str | None) -> "None | __import__('datetime').date":
     """Parse YYYY-MM-DD; return None on failure or empty."""
     if not val or not val.strip():
@@ -90,6 +108,35 @@ def safe_int(val: str | None, default: int = 0) -> int:
         return default
 
 
+def normalize_row(row: dict, col_map: dict[str, str | None], line: int) -> tuple[dict | None, str]:
+    """Map one CSV row to Inventory column values, or (None, skip reason)."""
+    sku_raw = (row.get(col_map["sku_id"]) or "").strip()
+    name_raw = (row.get(col_map["name"]) or "").strip()
+    cat_raw = (row.get(col_map["category"]) or "").strip()
+
+    # Validate required fields
+    missing = [field for field, val in (("sku_id", sku_raw), ("name", name_raw), ("category", cat_raw)) if not val]
+    if missing:
+        return None, f"row {line}: missing " + ",".join(missing)
+
+    description = (row.get(col_map["description"]) if col_map["description"] else "") or ""
+    status_val = (row.get(col_map["status"]) if col_map["status"] else "active") or "active"
+    status_val = status_val.strip().lower()
+    if status_val not in ("active", "inactive", "deleted"):
+        status_val = "active"
+
+    return {
+        "sku_id": sku_raw,
+        "name": name_raw,
+        "category": cat_raw,
+        "price": safe_float(row.get(col_map["price"]) if col_map["price"] else None),
+        "quantity": safe_int(row.get(col_map["quantity"]) if col_map["quantity"] else None),
+        "expiry": parse_date(row.get(col_map["expiry"]) if col_map["expiry"] else None),
+        "description": description.strip(),
+        "status": status_val,
+    }, ""
+
+
 # ---------------------------------------------------------------------------
 # Ensure sku_id column exists in SQLite (ALTER TABLE if needed)
 # ---------------------------------------------------------------------------
@@ -108,26 +155,62 @@ def ensure_sku_id_column() -> None:
 # ---------------------------------------------------------------------------
 # Core import logic
 # ---------------------------------------------------------------------------
-def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose: bool = False) -> None:
+def read_header(reader: csv.DictReader) -> dict[str, str | None]:
+    """Column mapping for ``reader``'s header; exits if a required column is missing."""
+    if reader.fieldnames is None:
+        print("[error] CSV has no header row.")
+        sys.exit(1)
+
+    col_map = resolve_columns(list(reader.fieldnames))
+
+    # Validate required columns
+    for req in ("sku_id", "name", "category"):
+        if col_map[req] is None:
+            print(f"[error] Required column '{req}' not found in CSV. Header: {reader.fieldnames}")
+            sys.exit(1)
+    return col_map
+
+
+def run_import(
+    csv_path: str,
+    *,
+    dry_run: bool = False,
+    limit: int = 0,
+    verbose: bool = False,
+    bulk: bool = False,
+    stream: bool = False,
+    chunk_size: int = 10_000,
+    workers: int = 0,
+    resume: bool = False,
+) -> None:
+    started = time.perf_counter()
     if not os.path.isfile(csv_path):
         print(f"[error] CSV file not found: {csv_path}")
         sys.exit(1)
 
+    # Counters ---------------------------------------------------------------
+    stats = {
+        "categories_inserted": 0,
+        "categories_reused": 0,
+        "products_inserted": 0,
+        "products_updated": 0,
+        "products_unchanged": 0,
+        "rows_skipped": 0,
+        "skip_reasons": [],
+    }
+
+    if stream:
+        row_count = stream_import(
+            csv_path, stats, dry_run=dry_run, limit=limit, verbose=verbose,
+            chunk_size=chunk_size, workers=workers, resume=resume,
+        )
+        print_summary(stats, row_count, time.perf_counter() - started)
+        return
+
     # Read CSV ---------------------------------------------------------------
     with open(csv_path, newline="", encoding="utf-8-sig") as fh:
         reader = csv.DictReader(fh)
-        if reader.fieldnames is None:
-            print("[error] CSV has no header row.")
-            sys.exit(1)
-
-        col_map = resolve_columns(list(reader.fieldnames))
-
-        # Validate required columns
-        for req in ("sku_id", "name", "category"):
-            if col_map[req] is None:
-                print(f"[error] Required column '{req}' not found in CSV. Header: {reader.fieldnames}")
-                sys.exit(1)
-
+        col_map = read_header(reader)
         rows = list(reader)
 
     print(f"[info] CSV loaded: {len(rows)} rows, columns mapped: { {k: v for k, v in col_map.items() if v} }")
@@ -136,15 +219,10 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
         rows = rows[:limit]
         print(f"[info] --limit applied: processing first {limit} rows")
 
-    # Counters ---------------------------------------------------------------
-    stats = {
-        "categories_inserted": 0,
-        "categories_reused": 0,
-        "products_inserted": 0,
-        "products_updated": 0,
-        "rows_skipped": 0,
-        "skip_reasons": [],
-    }
+    if bulk:
+        bulk_import(rows, col_map, stats, dry_run=dry_run, verbose=verbose, chunk_size=chunk_size)
+        print_summary(stats, len(rows), time.perf_counter() - started)
+        return
 
     # -- Phase 1: Upsert categories -----------------------------------------
     # Collect unique category names from the CSV
@@ -199,36 +277,17 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
     processed = 0
 
     for i, row in enumerate(rows):
-        sku_raw = (row.get(col_map["sku_id"]) or "").strip()
-        name_raw = (row.get(col_map["name"]) or "").strip()
-        cat_raw = (row.get(col_map["category"]) or "").strip()
-
-        # Validate required fields
-        if not sku_raw or not name_raw or not cat_raw:
-            reason = f"row {i+1}: missing"
-            missing = []
-            if not sku_raw:
-                missing.append("sku_id")
-            if not name_raw:
-                missing.append("name")
-            if not cat_raw:
-                missing.append("category")
-            reason += " " + ",".join(missing)
+        values, reason = normalize_row(row, col_map, i + 1)
+        if values is None:
             stats["rows_skipped"] += 1
             stats["skip_reasons"].append(reason)
             if verbose:
                 print(f"  [skip] {reason}")
             continue
 
-        price = safe_float(row.get(col_map["price"]) if col_map["price"] else None)
-        quantity = safe_int(row.get(col_map["quantity"]) if col_map["quantity"] else None)
-        expiry = parse_date(row.get(col_map["expiry"]) if col_map["expiry"] else None)
-        description = (row.get(col_map["description"]) if col_map["description"] else "") or ""
-        description = description.strip()
-        status_val = (row.get(col_map["status"]) if col_map["status"] else "active") or "active"
-        status_val = status_val.strip().lower()
-        if status_val not in ("active", "inactive", "deleted"):
-            status_val = "active"
+        sku_raw, name_raw, cat_raw = values["sku_id"], values["name"], values["category"]
+        price, quantity, expiry = values["price"], values["quantity"], values["expiry"]
+        description, status_val = values["description"], values["status"]
 
         sku_upper = sku_raw.upper()
 
@@ -238,7 +297,13 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
             # Fallback: match by name
             existing = name_cache.get(name_raw.lower())
 
-        if existing is not None:
+        fingerprint = Inventory.content_hash_of(values)
+        if existing is not None and existing.content_hash == fingerprint:
+            # Same row as the last import and untouched since
+            stats["products_unchanged"] += 1
+            if verbose:
+                print(f"  [product] unchanged: {sku_raw} – {name_raw}")
+        elif existing is not None:
             # UPDATE existing product
             if not dry_run:
                 existing.sku_id = sku_raw
@@ -253,6 +318,7 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
                 if description:
                     existing.description = description
                 existing.status = status_val
+                existing.content_hash = fingerprint
             stats["products_updated"] += 1
             if verbose:
                 print(f"  [product] UPDATE: {sku_raw} – {name_raw}")
@@ -271,6 +337,7 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
                     expiry=expiry,
                     description=description,
                     status=status_val,
+                    content_hash=fingerprint,
                 )
                 db.session.add(new_inv)
                 sku_cache[sku_upper] = new_inv
@@ -290,6 +357,451 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
     else:
         print("[info] DRY RUN – no changes written to database.")
 
+    print_summary(stats, len(rows), time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# Bulk upsert mode (--bulk)
+# ---------------------------------------------------------------------------
+# Below this many rows the search-index triggers are cheaper than a rebuild
+BULK_DEFER_SEARCH_MIN_ROWS = 10_000
+# Skip reasons kept for the summary; the count is always exact
+MAX_SKIP_REASONS = 100
+
+
+def bulk_import(
+    rows: list[dict],
+    col_map: dict[str, str | None],
+    stats: dict,
+    *,
+    dry_run: bool,
+    verbose: bool,
+    chunk_size: int,
+) -> None:
+    """Upsert with set-based statements, in one transaction.
+
+    Same rules as the ORM path: zero price/quantity and empty expiry or
+    description never overwrite stored values, and deleted categories are
+    reactivated. Products match on case-insensitive SKU, then on
+    case-insensitive name, before the upsert.
+
+    Products whose stored content hash matches the CSV row are skipped, and
+    a feed with nothing new writes nothing. Loads that change a large
+    share of the catalog suspend the per-row search-index triggers and
+    rebuild the index once at the end.
+    """
+    stmt, adopt = product_upsert_statements()
+
+    # -- Phase 1: Find new and changed products (reads only) -----------------
+    batches = []
+    known: dict[str, str] = {}
+    pending: dict[str, dict] = {}
+    for i, row in enumerate(rows):
+        values, reason = normalize_row(row, col_map, i + 1)
+        if values is None:
+            skip_row(stats, reason, verbose)
+            continue
+        add_product(pending, values, stats)
+        if len(pending) >= chunk_size:
+            batches.append(changed_products(pending, stats, known, verbose=verbose))
+            pending = {}
+    if pending:
+        batches.append(changed_products(pending, stats, known, verbose=verbose))
+    changed = sum(len(changed_rows) for changed_rows, _ in batches)
+
+    # -- Phase 2: Categories (one read, one insert, one reactivation) --------
+    cat_names: dict[str, str] = {}
+    for row in rows:
+        raw_cat = (row.get(col_map["category"]) or "").strip()
+        if raw_cat:
+            cat_names.setdefault(raw_cat.lower(), raw_cat)
+    if dry_run:
+        upsert_categories(cat_names, load_category_statuses(), stats, dry_run=True, verbose=verbose)
+        print("[info] DRY RUN – no changes written to database.")
+        return
+    wrote = upsert_categories(cat_names, load_category_statuses(), stats, dry_run=False, verbose=verbose)
+    if not wrote and not changed:
+        print("[info] Nothing to write; the database already matches the CSV.")
+        return
+    # Core statements bypass the ORM flush hook that bumps cache versions.
+    # This also opens the write transaction before any search-index DDL.
+    bump_table_versions(db.session, {"inventory", "category"})
+
+    # -- Phase 3: Products, chunk by chunk -----------------------------------
+    catalog_size = db.session.scalar(db.select(db.func.count(Inventory.id)))
+    defer_search = changed >= BULK_DEFER_SEARCH_MIN_ROWS and changed * 4 >= catalog_size
+    with inventory_search.deferred_sync(db.session.connection()) if defer_search else nullcontext():
+        for changed_rows, adopted in batches:
+            write_products(changed_rows, adopted, stmt, adopt)
+
+    db.session.commit()
+    print("[info] All changes committed.")
+
+
+def product_upsert_statements():
+    """(upsert, adopt) statements: the ON CONFLICT(sku_id) upsert and a SKU assignment by id."""
+    dialect = db.session.connection().dialect.name
+    upsert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if upsert is None:
+        print(f"[error] --bulk and --stream need SQLite or PostgreSQL (database is {dialect})")
+        sys.exit(1)
+
+    inv = Inventory.__table__
+    stmt = upsert(inv)
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[inv.c.sku_id],
+        set_={
+            "name": new.name,
+            "category": new.category,
+            "price": db.case((new.price > 0, new.price), else_=inv.c.price),
+            "quantity": db.case((new.quantity > 0, new.quantity), else_=inv.c.quantity),
+            "expiry": db.func.coalesce(new.expiry, inv.c.expiry),
+            "description": db.case((new.description != "", new.description), else_=inv.c.description),
+            "status": new.status,
+            "updated_at": new.updated_at,
+            "content_hash": new.content_hash,
+        },
+    )
+    adopt = db.update(inv).where(inv.c.id == db.bindparam("b_id")).values(sku_id=db.bindparam("b_sku"))
+    return stmt, adopt
+
+
+def load_category_statuses() -> dict[str, str]:
+    return {
+        name.strip().lower(): status
+        for name, status in db.session.execute(db.select(Category.name, Category.status))
+    }
+
+
+def upsert_categories(
+    cat_names: dict[str, str], known: dict[str, str], stats: dict, *, dry_run: bool, verbose: bool
+) -> bool:
+    """Insert new and reactivate deleted categories among ``cat_names`` (lowercase -> name).
+
+    ``known`` (lowercase name -> status) is updated to match. Returns
+    whether anything was (or, in a dry run, would be) written.
+    """
+    new_cats = [name for key, name in sorted(cat_names.items()) if key not in known]
+    revive = [key for key in cat_names if known.get(key) == "deleted"]
+    stats["categories_inserted"] += len(new_cats)
+    stats["categories_reused"] += len(cat_names) - len(new_cats)
+    if verbose:
+        for name in new_cats:
+            print(f"  [cat] INSERT: {name}")
+    known.update((key, "active") for key in cat_names)
+    if dry_run:
+        return bool(new_cats or revive)
+
+    if new_cats:
+        db.session.execute(
+            db.insert(Category), [{"name": name, "description": "", "status": "active"} for name in new_cats]
+        )
+    if revive:
+        db.session.execute(
+            db.update(Category)
+            .where(db.func.lower(db.func.trim(Category.name)).in_(revive), Category.status == "deleted")
+            .values(status="active", updated_at=datetime.utcnow())
+        )
+    return bool(new_cats or revive)
+
+
+def add_product(pending: dict[str, dict], values: dict, stats: dict) -> None:
+    upper = values["sku_id"].upper()
+    previous = pending.get(upper)
+    if previous is not None:
+        # A repeated SKU in one chunk: apply it the way a second UPDATE would
+        values = merge_product(previous, values)
+        stats["products_updated"] += 1
+    pending[upper] = values
+
+
+def skip_row(stats: dict, reason: str, verbose: bool) -> None:
+    stats["rows_skipped"] += 1
+    if len(stats["skip_reasons"]) < MAX_SKIP_REASONS:
+        stats["skip_reasons"].append(reason)
+    if verbose:
+        print(f"  [skip] {reason}")
+
+
+def merge_product(old: dict, new: dict) -> dict:
+    merged = dict(new)
+    for field in ("price", "quantity"):
+        if new[field] <= 0:
+            merged[field] = old[field]
+    if new["expiry"] is None:
+        merged["expiry"] = old["expiry"]
+    if not new["description"]:
+        merged["description"] = old["description"]
+    return merged
+
+
+def changed_products(
+    pending: dict[str, dict], stats: dict, known: dict[str, str], *, verbose: bool
+) -> tuple[list[dict], list[dict]]:
+    """Split out the new and changed products of ``pending`` (upper-cased sku_id -> values).
+
+    Stored products are found as in the ORM path: by case-insensitive SKU,
+    then by case-insensitive name. A SKU match is written under the stored
+    SKU, so the ON CONFLICT(sku_id) upsert updates that row; a name match
+    first has its SKU replaced by the feed's. Returns ``(rows, adopted)``:
+    upsert parameters with their content hash, and those SKU assignments.
+    ``known`` maps upper-cased SKUs to the SKU their row has once earlier
+    chunks are written, and is updated. Reads only.
+    """
+    # Expanding bind parameters: literal IN lists would be kept alive by
+    # the statement cache, holding every SKU of the feed in memory
+    stored: dict[str, tuple[int, str, str | None]] = {}
+    lookup = [upper for upper in pending if upper not in known]
+    if lookup:
+        for row_id, sku, content_hash in db.session.execute(
+            db.select(Inventory.id, Inventory.sku_id, Inventory.content_hash)
+            .where(db.func.upper(Inventory.sku_id).in_(db.bindparam("skus", expanding=True)))
+            .order_by(Inventory.id),
+            {"skus": lookup},
+        ):
+            upper = sku.strip().upper()
+            # Of stored SKUs that differ only in case, prefer the feed's spelling
+            if upper in pending and stored.get(upper, (0, None))[1] != pending[upper]["sku_id"]:
+                stored[upper] = (row_id, sku, content_hash)
+
+    # No SKU match: fall back to the name, as the ORM path does
+    by_name = {
+        values["name"].lower(): upper
+        for upper, values in pending.items()
+        if upper not in known and upper not in stored
+    }
+    adopted, renamed = [], {}
+    if by_name:
+        matches = {}
+        for row_id, sku, name in db.session.execute(
+            db.select(Inventory.id, Inventory.sku_id, db.func.lower(Inventory.name))
+            .where(db.func.lower(Inventory.name).in_(db.bindparam("names", expanding=True)))
+            .order_by(Inventory.id),
+            {"names": list(by_name)},
+        ):
+            matches[name] = (row_id, sku)
+        targeted = {row_id: upper for upper, (row_id, _, _) in stored.items()}
+        order = {upper: i for i, upper in enumerate(pending)}
+        pending = dict(pending)
+        for name, (row_id, old_sku) in matches.items():
+            upper = by_name[name]
+            if row_id in targeted:
+                # The same stored product under its own SKU too: one product
+                # repeated in the chunk, merged in feed order
+                other = targeted[row_id]
+                first, last = sorted((upper, other), key=order.get)
+                merged = merge_product(pending[first], pending[last])
+                pending[other] = {**merged, "sku_id": pending[other]["sku_id"]}
+                del pending[upper]
+                stats["products_updated"] += 1
+                continue
+            adopted.append({"b_id": row_id, "b_sku": pending[upper]["sku_id"]})
+            renamed[upper] = old_sku
+
+    rows = []
+    for upper, values in pending.items():
+        if upper in known:
+            sku, existing, previous_hash = known[upper], True, None
+        elif upper in stored:
+            _, sku, previous_hash = stored[upper]
+            existing = True
+        else:
+            sku, existing, previous_hash = values["sku_id"], upper in renamed, None
+        values = {**values, "sku_id": sku}
+        values["content_hash"] = Inventory.content_hash_of(values)
+        if existing and previous_hash == values["content_hash"]:
+            # Same row as the last import, and untouched since
+            stats["products_unchanged"] += 1
+            if verbose:
+                print(f"  [product] unchanged: {sku} – {values['name']}")
+            continue
+        rows.append(values)
+        known[upper] = sku
+        if renamed.get(upper):
+            # Later rows with the replaced SKU update the same product
+            known.setdefault(renamed[upper].strip().upper(), sku)
+        stats["products_updated" if existing else "products_inserted"] += 1
+        if verbose:
+            print(f"  [product] {'UPDATE' if existing else 'INSERT'}: {sku} – {values['name']}")
+    return rows, adopted
+
+
+def write_products(rows: list[dict], adopted: list[dict], stmt, adopt) -> None:
+    """Apply a ``changed_products`` result with the upsert statements."""
+    if adopted:
+        db.session.connection().execute(adopt, adopted)
+    if rows:
+        now = datetime.utcnow()
+        db.session.connection().execute(stmt, [{**values, "updated_at": now} for values in rows])
+
+
+# ---------------------------------------------------------------------------
+# Streaming mode (--stream)
+# ---------------------------------------------------------------------------
+def read_chunks(reader: csv.DictReader, chunk_size: int, *, skip: int = 0, limit: int = 0):
+    """Yield ``(first_line, rows)`` chunks of data rows, after skipping ``skip`` rows."""
+    for _ in itertools.islice(reader, skip):
+        pass
+    line = skip + 1
+    remaining = limit - skip if limit > 0 else None
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = list(itertools.islice(reader, size))
+        if not rows:
+            return
+        yield line, rows
+        line += len(rows)
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def normalize_chunk(job: tuple[int, list[dict], dict[str, str | None]]) -> tuple[int, int, dict, list, list]:
+    """Parse one chunk: (first_line, rows read, categories, products, skip reasons)."""
+    line, rows, col_map = job
+    categories: dict[str, str] = {}
+    products, reasons = [], []
+    for offset, row in enumerate(rows):
+        raw_cat = (row.get(col_map["category"]) or "").strip()
+        if raw_cat:
+            categories.setdefault(raw_cat.lower(), raw_cat)
+        values, reason = normalize_row(row, col_map, line + offset)
+        if values is None:
+            reasons.append(reason)
+        else:
+            products.append(values)
+    return line, len(rows), categories, products, reasons
+
+
+def normalized_chunks(chunks, col_map: dict[str, str | None], workers: int):
+    """``normalize_chunk`` over ``chunks`` in order, on up to ``workers`` processes.
+
+    At most two chunks per worker are in flight, so reading never runs
+    more than that far ahead of the database writes.
+    """
+    if workers <= 1:
+        for line, rows in chunks:
+            yield normalize_chunk((line, rows, col_map))
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        in_flight: deque = deque()
+        for line, rows in chunks:
+            in_flight.append(pool.apply_async(normalize_chunk, ((line, rows, col_map),)))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+
+def checkpoint_path_for(csv_path: str) -> str:
+    return csv_path + ".import-checkpoint.json"
+
+
+def csv_fingerprint(csv_path: str) -> dict:
+    st = os.stat(csv_path)
+    return {"csv": os.path.abspath(csv_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_checkpoint(csv_path: str) -> dict | None:
+    path = checkpoint_path_for(csv_path)
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        state = json.load(fh)
+    if state.get("file") != csv_fingerprint(csv_path):
+        print(f"[error] {path} was written for a different version of the CSV; delete it to start over")
+        sys.exit(1)
+    return state
+
+
+def save_checkpoint(csv_path: str, rows_done: int, stats: dict) -> None:
+    """Record progress after a commit; written atomically."""
+    path = checkpoint_path_for(csv_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"file": csv_fingerprint(csv_path), "rows_done": rows_done, "stats": stats}, fh)
+    os.replace(tmp, path)
+
+
+def stream_import(
+    csv_path: str,
+    stats: dict,
+    *,
+    dry_run: bool,
+    limit: int,
+    verbose: bool,
+    chunk_size: int,
+    workers: int,
+    resume: bool,
+) -> int:
+    """Import in constant memory, committing each chunk; returns rows processed.
+
+    The CSV is read ``chunk_size`` rows at a time, parsed (optionally in a
+    process pool), upserted with the --bulk statements and committed. After
+    each commit a checkpoint next to the CSV records the rows done, so
+    ``--resume`` continues after the last committed chunk. A chunk that
+    committed just before a crash is applied again on resume, which the
+    upsert makes harmless.
+    """
+    stmt, adopt = product_upsert_statements()
+    state = load_checkpoint(csv_path) if resume else None
+    if resume and state is None:
+        print("[info] No checkpoint found; starting from the first row")
+    rows_done = 0
+    if state is not None:
+        rows_done = state["rows_done"]
+        stats.update(state["stats"])
+        print(f"[info] Resuming after row {rows_done:,}")
+    elif not dry_run and os.path.isfile(checkpoint_path_for(csv_path)):
+        os.remove(checkpoint_path_for(csv_path))
+
+    known_cats = load_category_statuses()
+    seen_cats: set[str] = set()
+    total_bytes = os.path.getsize(csv_path) or 1
+    started = time.perf_counter()
+    processed = 0
+
+    with open(csv_path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.DictReader(fh)
+        col_map = read_header(reader)
+        print(f"[info] Streaming CSV in chunks of {chunk_size:,}, columns mapped: "
+              f"{ {k: v for k, v in col_map.items() if v} }")
+        chunks = read_chunks(reader, chunk_size, skip=rows_done, limit=limit)
+        for line, count, categories, products, reasons in normalized_chunks(chunks, col_map, workers):
+            for reason in reasons:
+                skip_row(stats, reason, verbose)
+            pending: dict[str, dict] = {}
+            for values in products:
+                add_product(pending, values, stats)
+            changed_rows, adopted = changed_products(pending, stats, {}, verbose=verbose) if pending else ([], [])
+            categories = {key: name for key, name in categories.items() if key not in seen_cats}
+            seen_cats.update(categories)
+            wrote = upsert_categories(categories, known_cats, stats, dry_run=dry_run, verbose=verbose)
+            if not dry_run and (wrote or changed_rows or adopted):
+                # Core statements bypass the ORM flush hook that bumps cache versions
+                bump_table_versions(db.session, {"inventory", "category"})
+                write_products(changed_rows, adopted, stmt, adopt)
+
+            rows_done = line - 1 + count
+            processed += count
+            if not dry_run:
+                db.session.commit()
+                save_checkpoint(csv_path, rows_done, stats)
+
+            elapsed = time.perf_counter() - started
+            pct = min(100.0, 100.0 * fh.buffer.tell() / total_bytes)
+            print(f"[progress] {rows_done:,} rows ({pct:.0f}%) – {processed / elapsed if elapsed else 0:,.0f} rows/s")
+
+    if not dry_run:
+        os.remove(checkpoint_path_for(csv_path))
+        print("[info] All changes committed.")
+    else:
+        print("[info] DRY RUN – no changes written to database.")
+    return processed
+
+
+def print_summary(stats: dict, row_count: int, elapsed: float) -> None:
     # Summary ----------------------------------------------------------------
     print("\n" + "=" * 55)
     print("  IMPORT SUMMARY")
@@ -298,11 +810,19 @@ def run_import(csv_path: str, *, dry_run: bool = False, limit: int = 0, verbose:
     print(f"  Categories reused   : {stats['categories_reused']}")
     print(f"  Products inserted   : {stats['products_inserted']}")
     print(f"  Products updated    : {stats['products_updated']}")
+    print(f"  Products unchanged  : {stats['products_unchanged']}")
     print(f"  Rows skipped        : {stats['rows_skipped']}")
     if stats["skip_reasons"]:
         print("  Skip reasons:")
         for r in stats["skip_reasons"]:
             print(f"    - {r}")
+        if stats["rows_skipped"] > len(stats["skip_reasons"]):
+            print(f"    … and {stats['rows_skipped'] - len(stats['skip_reasons'])} more")
+    print(f"  Elapsed             : {elapsed:.2f}s")
+    print(f"  Rows / sec          : {row_count / elapsed if elapsed else 0:,.0f}")
+    if resource is not None:
+        # ru_maxrss is KiB on Linux
+        print(f"  Peak RSS            : {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB")
     print("=" * 55)
 
 
@@ -317,11 +837,38 @@ def main() -> None:
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without writing to DB")
     parser.add_argument("--limit", type=int, default=0, help="Max rows to process (0 = all)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print per-row details")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Set-based INSERT ... ON CONFLICT(sku_id) DO UPDATE in one transaction (large feeds)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Constant-memory import: read, upsert and commit one chunk at a time")
+    parser.add_argument("--chunk-size", type=int, default=10_000,
+                        help="Rows per executemany (--bulk) or per committed chunk (--stream)")
+    parser.add_argument("--workers", type=int, default=0, help="Processes parsing chunks in --stream mode (0 = inline)")
+    parser.add_argument("--resume", action="store_true", help="Continue a --stream import from its checkpoint")
     args = parser.parse_args()
+    if args.chunk_size <= 0:
+        print("[error] --chunk-size must be positive")
+        sys.exit(1)
+    if args.bulk and args.stream:
+        print("[error] choose one of --bulk and --stream")
+        sys.exit(1)
+    if args.resume and not args.stream:
+        print("[error] --resume only applies to --stream imports")
+        sys.exit(1)
 
     with app.app_context():
         ensure_sku_id_column()
-        run_import(args.csv, dry_run=args.dry_run, limit=args.limit, verbose=args.verbose)
+        run_import(
+            args.csv,
+            dry_run=args.dry_run,
+            limit=args.limit,
+            verbose=args.verbose,
+            bulk=args.bulk,
+            stream=args.stream,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            resume=args.resume,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+backend/scripts/materialize_forecasts.py
+
+Precompute forecasts for every saved model over a rolling horizon and store
+them in the materialized_forecast table, so GET /predict can answer common
+SKU/date/weather combinations with one indexed lookup. Meant to run nightly.
+
+Usage:
+    python backend/scripts/materialize_forecasts.py
+    python backend/scripts/materialize_forecasts.py --days 30 --temps 20,25,30 --holidays 0,1
+    python backend/scripts/materialize_forecasts.py --sku SKU0001 --sku SKU0002 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Ensure the backend package is importable regardless of cwd
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = Path(__file__).resolve().parent          # backend/scripts/
+BACKEND_DIR = SCRIPT_DIR.parent                        # backend/
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app import app                                    # noqa: E402
+from forecast import get_model_registry                # noqa: E402
+from forecast_pool import ForecastPool, score_jobs     # noqa: E402
+from models import db, MaterializedForecast            # noqa: E402
+
+
+def parse_float_list(val: str) -> list[float]:
+    return [float(v) for v in val.split(",") if v.strip()]
+
+
+def parse_int_list(val: str) -> list[int]:
+    return [int(v) for v in val.split(",") if v.strip()]
+
+
+def discover_skus(model_dir: str, suffix: str) -> list[str]:
+    return sorted(f[: -len(suffix)] for f in os.listdir(model_dir) if f.endswith(suffix))
+
+
+# ---------------------------------------------------------------------------
+# Core materialization logic
+# ---------------------------------------------------------------------------
+def run_materialize(
+    *,
+    start: date,
+    days: int,
+    temps: list[float],
+    rains: list[float],
+    holidays: list[int],
+    skus: list[str] | None = None,
+    workers: int = 0,
+    prune: bool = False,
+    dry_run: bool = False,
+) -> None:
+    model_registry = get_model_registry()
+    if skus is None:
+        skus = discover_skus(model_registry.model_dir, model_registry.suffix)
+    end = start + timedelta(days=days - 1)
+    scenarios = list(itertools.product(temps, rains, holidays))
+    dates = [datetime.combine(start + timedelta(days=i), datetime.min.time()) for i in range(days)]
+
+    print(
+        f"[info] {len(skus)} SKUs × {days} days ({start} → {end}) × "
+        f"{len(scenarios)} weather scenarios = {len(skus) * days * len(scenarios)} rows"
+    )
+    if dry_run:
+        print("[info] DRY RUN – nothing computed or written.")
+        return
+
+    # One frame per SKU covering every (date, scenario) pair
+    frame = {"ds": [], "temp_c": [], "rain_mm": [], "is_holiday": []}
+    for temp, rain, holiday in scenarios:
+        frame["ds"].extend(dates)
+        frame["temp_c"].extend([temp] * days)
+        frame["rain_mm"].extend([rain] * days)
+        frame["is_holiday"].extend([holiday] * days)
+
+    jobs = [(sku_id, frame) for sku_id in skus]
+    pool = ForecastPool(model_registry.model_dir, workers) if workers > 0 else None
+    results = pool.score(jobs) if pool else score_jobs(model_registry, jobs)
+
+    stats = {"skus_written": 0, "skus_missing": 0, "rows_written": 0}
+    started = time.perf_counter()
+    try:
+        for sku_id, forecast in results:
+            if forecast is None:
+                stats["skus_missing"] += 1
+                print(f"  [skip] {sku_id}: model not found")
+                continue
+            mtime = os.path.getmtime(model_registry.path_for(sku_id))
+            rows = [
+                {
+                    "sku_id": sku_id,
+                    "ds": ds.date(),
+                    "temp": temp,
+                    "rain": rain,
+                    "holiday": holiday,
+                    "yhat": yhat,
+                    "yhat_lower": lo,
+                    "yhat_upper": hi,
+                    "model_mtime": mtime,
+                    "computed_at": datetime.utcnow(),
+                }
+                for ds, temp, rain, holiday, yhat, lo, hi in zip(
+                    frame["ds"], frame["temp_c"], frame["rain_mm"], frame["is_holiday"],
+                    forecast["yhat"], forecast["yhat_lower"], forecast["yhat_upper"],
+                )
+            ]
+            # Replace this SKU's horizon wholesale, then bulk insert
+            MaterializedForecast.query.filter(
+                MaterializedForecast.sku_id == sku_id,
+                MaterializedForecast.ds.between(start, end),
+            ).delete(synchronize_session=False)
+            db.session.execute(db.insert(MaterializedForecast), rows)
+            db.session.commit()
+            stats["skus_written"] += 1
+            stats["rows_written"] += len(rows)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if prune:
+        pruned = MaterializedForecast.query.filter(
+            MaterializedForecast.ds < start
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        print(f"[info] Pruned {pruned} rows dated before {start}")
+
+    elapsed = time.perf_counter() - started
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  MATERIALIZE SUMMARY")
+    print("=" * 55)
+    print(f"  SKUs written        : {stats['skus_written']}")
+    print(f"  SKUs without model  : {stats['skus_missing']}")
+    print(f"  Rows written        : {stats['rows_written']}")
+    print(f"  Elapsed             : {elapsed:.1f}s")
+    print("=" * 55)
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute forecasts for saved models into the materialized_forecast table."
+    )
+    parser.add_argument("--start", help="First forecast date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=30, help="Horizon length in days (default: 30)")
+    parser.add_argument("--temps", default="25", help="Comma-separated temperatures in °C (default: 25)")
+    parser.add_argument("--rains", default="0", help="Comma-separated rainfall values in mm (default: 0)")
+    parser.add_argument("--holidays", default="0,1", help="Comma-separated holiday flags (default: 0,1)")
+    parser.add_argument("--sku", action="append", help="Only this SKU (repeatable; default: all models)")
+    parser.add_argument("--workers", type=int, default=0, help="Process-pool size (0 = run serially)")
+    parser.add_argument("--prune", action="store_true", help="Delete rows dated before --start")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be computed")
+    args = parser.parse_args()
+
+    try:
+        start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else date.today()
+        temps = parse_float_list(args.temps)
+        rains = parse_float_list(args.rains)
+        holidays = parse_int_list(args.holidays)
+    except ValueError as exc:
+        print(f"[error] {exc}")
+        sys.exit(1)
+    if args.days <= 0 or not temps or not rains or not holidays:
+        print("[error] --days must be positive and every scenario list non-empty")
+        sys.exit(1)
+
+    with app.app_context():
+        db.create_all()
+        run_materialize(
+            start=start,
+            days=args.days,
+            temps=temps,
+            rains=rains,
+            holidays=holidays,
+            skus=args.sku,
+            workers=args.workers,
+            prune=args.prune,
+            dry_run=args.dry_run,
+        )
+
+
+if __name__ == "__main__":
+    main()
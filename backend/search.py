@@ -0,0 +1,176 @@
+"""
+backend/search.py
+
+Full-text search over inventory name, category and description.
+
+``GET /api/inventory?search=`` used to OR three ``ILIKE '%term%'`` clauses,
+which can never use an index. ``install_inventory_search`` picks a backend
+for the database dialect, creates its index once at startup and returns it;
+the backend then narrows and ranks an Inventory query:
+
+* SQLite: an external-content FTS5 table kept in sync by triggers, ranked
+  with bm25 (name weighted over category over description).
+* Postgres: a GIN expression index on a weighted tsvector, ranked with
+  ts_rank.
+* Anything else (or SQLite built without FTS5): the original ILIKE scan.
+
+Every word of the search term is matched as a prefix, so type-ahead
+queries like ``choc chi`` find "Chocolate Chip Cookie".
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def search_words(term: str) -> list[str]:
+    return _WORD.findall(term.lower())
+
+
+class LikeSearch:
+    """Unindexed substring match; the fallback for unsupported databases."""
+
+    name = "like"
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+
+    def install(self, engine: Any) -> "LikeSearch":
+        return self
+
+    @contextmanager
+    def deferred_sync(self, conn: Any) -> Iterator[None]:
+        """Suspend per-row index maintenance for a bulk load on ``conn``."""
+        yield
+
+    def apply(self, query: Any, term: str) -> Any:
+        like = f"%{term}%"
+        m = self.model
+        return query.filter(or_(m.name.ilike(like), m.category.ilike(like), m.description.ilike(like)))
+
+
+class SqliteFtsSearch(LikeSearch):
+    """FTS5 index over name/category/description, synced by triggers."""
+
+    name = "sqlite-fts5"
+    fts_table = "inventory_fts"
+    columns = "name, category, description"
+    # bm25 column weights: name, category, description
+    weights = (10.0, 4.0, 1.0)
+
+    def install(self, engine: Any) -> LikeSearch:
+        fts = self.fts_table
+        try:
+            with engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+                ).first()
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({self.columns}, "
+                    f"content='{self.model.__tablename__}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                ))
+                self._create_triggers(conn)
+                if not exists:
+                    # Index rows written before the FTS table existed
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        except OperationalError as exc:
+            if "fts5" not in str(exc.orig).lower():
+                raise
+            return LikeSearch(self.model)
+        return self
+
+    def _create_triggers(self, conn: Any) -> None:
+        src = self.model.__tablename__
+        fts = self.fts_table
+        cols = self.columns
+        new_vals = "new.id, new.name, new.category, new.description"
+        old_vals = "'delete', old.id, old.name, old.category, old.description"
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {src} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES ({new_vals}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {src} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ({old_vals}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {src} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ({old_vals}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES ({new_vals}); END"
+        ))
+
+    @contextmanager
+    def deferred_sync(self, conn: Any) -> Iterator[None]:
+        """Drop the sync triggers on ``conn``, then rebuild the index once.
+
+        Cheaper than a trigger per row when a load touches a large share of
+        the table. ``conn`` must already be in a write transaction: SQLite
+        DDL is transactional, so other connections never see the triggers
+        missing, and a failed load rolls the drop back with everything else.
+        """
+        fts = self.fts_table
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+        yield
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        self._create_triggers(conn)
+
+    def apply(self, query: Any, term: str) -> Any:
+        words = search_words(term)
+        if not words:
+            return super().apply(query, term)
+        match = " ".join(f'"{w}"*' for w in words)
+        fts = literal_column(self.fts_table)
+        hits = (
+            select(
+                column("rowid").label("id"),
+                func.bm25(fts, *self.weights).label("rank"),
+            )
+            .select_from(table(self.fts_table))
+            .where(fts.op("MATCH")(match))
+            .subquery()
+        )
+        return query.join(hits, self.model.id == hits.c.id).order_by(hits.c.rank)
+
+
+class PostgresSearch(LikeSearch):
+    """GIN index on a weighted tsvector expression."""
+
+    name = "postgres-tsvector"
+    index_name = "ix_inventory_search"
+    # Must match the indexed expression exactly for the planner to use it
+    document = (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C')"
+    )
+
+    def install(self, engine: Any) -> LikeSearch:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {self.index_name} ON {self.model.__tablename__} "
+                f"USING gin (({self.document}))"
+            ))
+        return self
+
+    def apply(self, query: Any, term: str) -> Any:
+        words = search_words(term)
+        if not words:
+            return super().apply(query, term)
+        doc = literal_column(f"({self.document})")
+        tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{w}:*" for w in words))
+        return query.filter(doc.op("@@")(tsquery)).order_by(func.ts_rank(doc, tsquery).desc())
+
+
+def install_inventory_search(engine: Any, model: Any) -> LikeSearch:
+    """Create the search index for ``engine``'s dialect and return its backend."""
+    backend = {"sqlite": SqliteFtsSearch, "postgresql": PostgresSearch}.get(engine.dialect.name, LikeSearch)
+    return backend(model).install(engine)
@@ -0,0 +1,107 @@
+"""
+backend/tests/test_cursors.py
+
+Page cursors are opaque to clients but not trusted: a tampered cursor must
+get a 400, never a silently wrong page.
+
+Usage:
+    python -m pytest backend/tests
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# The app reads its configuration on import: point it at a throwaway database
+_db_dir = tempfile.mkdtemp(prefix="amo-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["FORECAST_WARMUP"] = "false"
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import app, encode_cursor  # noqa: E402
+from models import db, Inventory, Transaction  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def client():
+    today = date.today()
+    with app.app_context():
+        for i in range(5):
+            db.session.add(Inventory(
+                sku_id=f"SKU{i + 1:04d}", name=f"Item {i}", quantity=5, price=1.0,
+                category="Dairy", expiry=today - timedelta(days=i + 1),
+            ))
+        db.session.flush()
+        for item in Inventory.query.all():
+            db.session.add(Transaction(
+                product_id=item.id, product_name=item.name, transaction_type="sale",
+                product_quantity=1, total_price=1.0,
+            ))
+        db.session.commit()
+        token = create_access_token(identity="1")
+    test_client = app.test_client()
+    test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return test_client
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor("id", -5),
+    encode_cursor("id", 2.5),
+    encode_cursor("id", "3"),
+    encode_cursor("id", True),
+    encode_cursor("offset", 2),
+    encode_cursor("id"),
+    "not-a-cursor",
+])
+def test_inventory_rejects_tampered_cursor(client, cursor):
+    assert client.get(f"/api/inventory?limit=2&cursor={cursor}").status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor("offset", -1),
+    encode_cursor("offset", 1.5),
+])
+def test_search_rejects_tampered_cursor(client, cursor):
+    assert client.get(f"/api/inventory?search=item&limit=2&cursor={cursor}").status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor("2026-01-01T00:00:00", -1),
+    encode_cursor("2026-01-01T00:00:00", 1.5),
+    encode_cursor(20260101, 1),
+])
+def test_transactions_reject_tampered_cursor(client, cursor):
+    assert client.get(f"/api/transactions?limit=2&cursor={cursor}").status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor(0, None, -1),
+    encode_cursor(0, None, 1.5),
+    encode_cursor(-1, None, 1),
+    encode_cursor(5, None, 1),
+    encode_cursor(0, "yesterday", 1),
+])
+def test_expiry_radar_rejects_tampered_cursor(client, cursor):
+    assert client.get(f"/api/expiry-radar?bucket=expired&limit=2&cursor={cursor}").status_code == 400
+
+
+def test_valid_cursors_page_through(client):
+    first = client.get("/api/inventory?limit=2").get_json()
+    second = client.get(f"/api/inventory?limit=2&cursor={first['nextCursor']}").get_json()
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert len(ids) == len(set(ids)) == 4
+
+    page = client.get("/api/expiry-radar?bucket=expired&limit=2").get_json()
+    rest = client.get(f"/api/expiry-radar?bucket=expired&limit=2&cursor={page['nextCursor']}")
+    assert rest.status_code == 200
@@ -0,0 +1,107 @@
+"""
+backend/warmup.py
+
+Background forecast warm-up run once at process start.
+
+Right after a deploy the first forecast requests would otherwise pay for
+unpickling models and the first-call costs of pandas/NumPy. ``Warmup``
+preloads a chosen set of SKU models into the registry (by default the
+top-N SKUs by recent sales volume) on a daemon thread and records its
+progress so /healthz/ready can hold traffic back until it is done.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+
+class Warmup:
+    """Tracks warm-up progress; ``run`` does the work, ``start`` backgrounds it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = {
+            "status": "disabled",
+            "loaded": 0,
+            "failed": 0,
+            "total": 0,
+            "started_at": None,
+            "finished_at": None,
+            "seconds": None,
+            "error": None,
+        }
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            # A failed warm-up still serves traffic, just cold
+            return self._state["status"] in ("ready", "disabled", "failed")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._state)
+
+    def _update(self, **changes: Any) -> None:
+        with self._lock:
+            self._state.update(changes)
+
+    def start(self, app: Any, select_skus: Callable[[], list[str]], load: Callable[[str], Any],
+              prepare: Callable[[], Any] | None = None) -> None:
+        self._update(status="pending")
+        thread = threading.Thread(
+            target=self.run, args=(app, select_skus, load, prepare), name="forecast-warmup", daemon=True
+        )
+        thread.start()
+
+    def run(self, app: Any, select_skus: Callable[[], list[str]], load: Callable[[str], Any],
+            prepare: Callable[[], Any] | None = None) -> None:
+        """Call ``prepare`` once, then ``load`` for every SKU from ``select_skus``."""
+        self._update(status="warming", started_at=datetime.utcnow().isoformat())
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                if prepare is not None:
+                    prepare()
+                skus = select_skus()
+            self._update(total=len(skus))
+            for sku_id in skus:
+                try:
+                    load(sku_id)
+                    with self._lock:
+                        self._state["loaded"] += 1
+                except Exception as exc:  # one bad artifact must not block readiness
+                    app.logger.warning("warm-up: %s failed: %s", sku_id, exc)
+                    with self._lock:
+                        self._state["failed"] += 1
+        except Exception as exc:
+            app.logger.exception("warm-up failed")
+            self._update(status="failed", error=str(exc), finished_at=datetime.utcnow().isoformat())
+            return
+        self._update(
+            status="ready",
+            finished_at=datetime.utcnow().isoformat(),
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+
+def top_skus_by_volume(db: Any, Inventory: Any, Transaction: Any, limit: int, days: int = 30) -> list[str]:
+    """SKUs with the most units sold over the last ``days`` days."""
+    since = datetime.utcnow() - timedelta(days=days)
+    units = db.func.sum(Transaction.product_quantity)
+    rows = (
+        db.session.query(Inventory.sku_id, units)
+        .join(Transaction, Transaction.product_id == Inventory.id)
+        .filter(
+            Transaction.transaction_type == "sale",
+            Transaction.time_of_transaction >= since,
+            Inventory.sku_id.isnot(None),
+        )
+        .group_by(Inventory.sku_id)
+        .order_by(units.desc())
+        .limit(limit)
+        .all()
+    )
+    return [sku_id for sku_id, _ in rows]
@@ -0,0 +1,41 @@
+"""
+benchmarks/
+
+Reproducible load tests for the backend, run from the repository root:
+
+* ``python -m benchmarks.generate`` fills a database with synthetic
+  categories, inventory and transactions at a chosen scale;
+* ``python -m benchmarks.run`` drives the real Flask app (through its test
+  client or a local WSGI server) with concurrent scenarios and writes
+  throughput, latency percentiles and peak RSS as JSON;
+* ``python -m benchmarks.compare`` diffs two result files and fails on
+  regressions.
+
+The backend reads its configuration when ``app`` is first imported, so
+every entry point calls ``use_backend`` before importing anything from it.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = REPO_DIR / "backend"
+RESULTS_DIR = REPO_DIR / "benchmarks" / "results"
+
+
+def database_url(database: str) -> str:
+    """``database`` as an SQLAlchemy URL; a bare path means an SQLite file."""
+    if "://" in database:
+        return database
+    return f"sqlite:///{os.path.abspath(database)}"
+
+
+def use_backend(env: dict[str, str]) -> None:
+    """Apply backend config overrides and make the backend importable."""
+    os.environ.setdefault("FORECAST_WARMUP", "false")
+    os.environ.update(env)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
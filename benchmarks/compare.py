@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+benchmarks/compare.py
+
+Compare two ``benchmarks.run`` result files and flag regressions.
+
+A scenario regresses when its throughput drops, or its p95 or p99
+latency grows, by more than ``--threshold``. It also regresses when it
+starts failing requests. The exit status is 1 if any scenario regressed,
+so the script can gate CI. Runs are only comparable with the same
+transport, concurrency and dataset, and the script warns when those
+differ.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/new.json
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+# Run settings that must match for the numbers to be comparable
+COMPARABLE = ("transport", "concurrency", "seconds", "dataset", "env")
+
+
+def change(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def compare(base: dict, new: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Return (report lines, regressions)."""
+    lines, regressions = [], []
+    for key in COMPARABLE:
+        if base["meta"].get(key) != new["meta"].get(key):
+            lines.append(f"  [warn] {key} differs: {base['meta'].get(key)} -> {new['meta'].get(key)}")
+
+    lines.append(f"  {'scenario':<14}{'req/s':>18}{'p50 ms':>22}{'p95 ms':>22}{'p99 ms':>22}")
+    for scenario in sorted(set(base["scenarios"]) & set(new["scenarios"])):
+        old, cur = base["scenarios"][scenario], new["scenarios"][scenario]
+        cells = [f"{old['throughput']:.1f}→{cur['throughput']:.1f} ({change(old['throughput'], cur['throughput']):+.0%})"]
+        for pct in ("p50", "p95", "p99"):
+            a, b = old["latencyMs"][pct], cur["latencyMs"][pct]
+            cells.append(f"{a:.1f}→{b:.1f} ({change(a, b):+.0%})")
+        lines.append(f"  {scenario:<14}" + "".join(f"{c:>22}" if i else f"{c:>18}" for i, c in enumerate(cells)))
+
+        if change(old["throughput"], cur["throughput"]) < -threshold:
+            regressions.append(f"{scenario}: throughput {change(old['throughput'], cur['throughput']):+.0%}")
+        for pct in ("p95", "p99"):
+            delta = change(old["latencyMs"][pct], cur["latencyMs"][pct])
+            if delta > threshold:
+                regressions.append(f"{scenario}: {pct} {delta:+.0%}")
+        if cur["errors"] and not old["errors"]:
+            regressions.append(f"{scenario}: {cur['errors']} failed requests (none before)")
+
+    for scenario in sorted(set(base["scenarios"]) ^ set(new["scenarios"])):
+        lines.append(f"  [info] {scenario} is only in {'the base' if scenario in base['scenarios'] else 'the new'} run")
+    return lines, regressions
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base", help="Baseline result JSON")
+    parser.add_argument("new", help="Result JSON to check")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change (default 0.2)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.base, encoding="utf-8") as fh:
+            base = json.load(fh)
+        with open(args.new, encoding="utf-8") as fh:
+            new = json.load(fh)
+    except (OSError, ValueError) as exc:
+        print(f"[error] {exc}")
+        sys.exit(2)
+
+    lines, regressions = compare(base, new, args.threshold)
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  BENCHMARK COMPARISON")
+    print("=" * 55)
+    print(f"  Base                : {args.base} ({base['meta'].get('gitCommit') or 'unknown'})")
+    print(f"  New                 : {args.new} ({new['meta'].get('gitCommit') or 'unknown'})")
+    print("\n".join(lines))
+    print(f"  Regressions         : {len(regressions)} (threshold {args.threshold:.0%})")
+    for regression in regressions:
+        print(f"    - {regression}")
+    print("=" * 55)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
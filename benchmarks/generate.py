@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+benchmarks/generate.py
+
+Fill an empty database with synthetic categories, inventory and
+transactions for the load tests.
+
+The data is a deterministic function of ``--seed`` and ``--today``.
+Expiry dates and transaction times are relative to ``--today``, which
+defaults to the current date, so pass it to generate identical databases
+on different days. The app still judges expiry against its own clock, so
+a database generated for another day has shifted expiry buckets. Its
+shape follows the real catalog:
+
+* SKUs are ``SKU0001``, ``SKU0002``, …, so the first 220 have forecasting
+  models in backend/saved_models/.
+* Names and descriptions come from a small grocery vocabulary, so search
+  terms match many rows.
+* About 6% of items are expired and 6% expire within 30 days. 20% have no
+  expiry date, and 2% are soft-deleted.
+* Sales are skewed towards a few best sellers, spread over ``--days`` of
+  history. About 10% of transactions are purchases.
+
+The daily_sales rollup is rebuilt at the end (scripts/backfill_daily_sales.py).
+
+Usage:
+    python -m benchmarks.generate --database /tmp/bench.db
+    python -m benchmarks.generate --database /tmp/bench-1m.db --skus 1000000 --transactions 10000000
+    python -m benchmarks.generate --database /tmp/bench.db --today 2026-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+from benchmarks import database_url, use_backend
+
+CATEGORIES = (
+    "Beverages", "Dairy", "Bakery", "Produce", "Meat", "Seafood", "Frozen", "Snacks",
+    "Pantry", "Breakfast", "Condiments", "Spices", "Canned Goods", "Deli", "Household",
+    "Personal Care", "Baby", "Pet Supplies", "Health", "Confectionery",
+)
+ADJECTIVES = (
+    "Organic", "Fresh", "Classic", "Smoked", "Roasted", "Spicy", "Sweet", "Whole",
+    "Light", "Premium", "Crunchy", "Creamy", "Wild", "Golden", "Salted", "Honey",
+)
+NOUNS = (
+    "Milk", "Cheese", "Yogurt", "Butter", "Bread", "Bagel", "Apple", "Banana", "Tomato",
+    "Potato", "Chicken", "Salmon", "Tuna", "Rice", "Pasta", "Coffee", "Tea", "Juice",
+    "Water", "Cookie", "Chocolate", "Chips", "Cereal", "Oats", "Honey", "Jam", "Ketchup",
+    "Pepper", "Soap", "Shampoo", "Diapers", "Biscuits",
+)
+ORIGINS = ("local farms", "the mountains", "the coast", "family bakeries", "our kitchen", "imported stock")
+
+
+def product_name(k: int) -> str:
+    """Name of the ``k``-th product (0-based); unique, and recomputable without storage."""
+    return f"{ADJECTIVES[k % len(ADJECTIVES)]} {NOUNS[(k // len(ADJECTIVES)) % len(NOUNS)]} {k + 1:06d}"
+
+
+def category_names(count: int) -> list[str]:
+    return [CATEGORIES[i] if i < len(CATEGORIES) else f"Category {i + 1:03d}" for i in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# Generators
+# ---------------------------------------------------------------------------
+def inventory_rows(rng: random.Random, skus: int, categories: list[str], prices: array, today: date):
+    for k in range(skus):
+        expiry = None if rng.random() < 0.2 else today + timedelta(days=rng.randint(-30, 365))
+        price = round(rng.lognormvariate(1.2, 0.8), 2) + 0.5
+        prices.append(price)
+        noun = NOUNS[(k // len(ADJECTIVES)) % len(NOUNS)].lower()
+        yield {
+            "sku_id": f"SKU{k + 1:04d}",
+            "name": product_name(k),
+            "expiry": expiry,
+            "quantity": 0 if rng.random() < 0.02 else rng.randint(1, 1000),
+            "category": categories[k % len(categories)],
+            "price": price,
+            "description": f"{rng.choice(ADJECTIVES).lower()} {noun} from {rng.choice(ORIGINS)}",
+            "status": "deleted" if rng.random() < 0.02 else "active",
+        }
+
+
+def transaction_rows(rng: random.Random, count: int, ids: array, prices: array, days: int, now: datetime):
+    span = days * 86400
+    n = len(ids)
+    for _ in range(count):
+        # Cubing a uniform draw puts most sales on the first few products
+        k = int(n * rng.random() ** 3)
+        quantity = rng.randint(1, 5)
+        sale = rng.random() >= 0.1
+        yield {
+            "product_id": ids[k],
+            "product_name": product_name(k),
+            "transaction_type": "sale" if sale else "purchase",
+            "product_quantity": quantity,
+            "total_price": round((1 if sale else -1) * quantity * prices[k], 2),
+            "time_of_transaction": now - timedelta(seconds=rng.random() * span),
+        }
+
+
+def chunked(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Core generation logic
+# ---------------------------------------------------------------------------
+def run_generate(
+    *, skus: int, transactions: int, categories: int, days: int, seed: int, today: date, chunk_size: int
+) -> None:
+    from app import app, inventory_search
+    from models import db, Category, Inventory, Transaction, bump_table_versions
+    from scripts.backfill_daily_sales import run_backfill
+
+    rng = random.Random(seed)
+    now = datetime.combine(today, datetime.min.time())
+    started = time.perf_counter()
+
+    with app.app_context():
+        existing = db.session.scalar(db.select(db.func.count(Inventory.id)))
+        if existing:
+            print(f"[error] The database already has {existing:,} inventory rows; generate into an empty one")
+            sys.exit(1)
+        if db.engine.dialect.name == "sqlite":
+            # Generated data can be regenerated: skip fsync on this connection
+            db.session.execute(db.text("PRAGMA synchronous=OFF"))
+
+        # -- Categories and inventory (one transaction; search index rebuilt once) --
+        names = category_names(categories)
+        db.session.execute(db.insert(Category), [{"name": n, "description": "", "status": "active"} for n in names])
+        bump_table_versions(db.session, {"category", "inventory"})
+        prices = array("d")
+        with inventory_search.deferred_sync(db.session.connection()):
+            for i, chunk in enumerate(chunked(inventory_rows(rng, skus, names, prices, today), chunk_size)):
+                db.session.connection().execute(db.insert(Inventory), chunk)
+                print(f"[progress] inventory {min((i + 1) * chunk_size, skus):,} / {skus:,}")
+        db.session.commit()
+        ids = array("q", db.session.scalars(db.select(Inventory.id).order_by(Inventory.id)))
+        inventory_done = time.perf_counter()
+
+        # -- Transactions, committed per chunk --------------------------------
+        for i, chunk in enumerate(chunked(transaction_rows(rng, transactions, ids, prices, days, now), chunk_size)):
+            db.session.connection().execute(db.insert(Transaction), chunk)
+            bump_table_versions(db.session, {"transaction"})
+            db.session.commit()
+            print(f"[progress] transactions {min((i + 1) * chunk_size, transactions):,} / {transactions:,}")
+        transactions_done = time.perf_counter()
+
+        run_backfill()
+
+    elapsed = time.perf_counter() - started
+
+    # Summary ----------------------------------------------------------------
+    print("\n" + "=" * 55)
+    print("  SYNTHETIC DATA SUMMARY")
+    print("=" * 55)
+    print(f"  Database            : {os.environ['DATABASE_URL']}")
+    print(f"  Seed / today        : {seed} / {today.isoformat()}")
+    print(f"  Categories          : {categories:,}")
+    print(f"  Inventory rows      : {skus:,} ({inventory_done - started:.1f}s)")
+    print(f"  Transactions        : {transactions:,} over {days} days ({transactions_done - inventory_done:.1f}s)")
+    print(f"  Elapsed             : {elapsed:.1f}s")
+    print("=" * 55)
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic database for the benchmarks.")
+    parser.add_argument("--database", required=True, help="SQLite file path or SQLAlchemy URL (must be empty)")
+    parser.add_argument("--skus", type=int, default=1000, help="Inventory rows (default 1000)")
+    parser.add_argument("--transactions", type=int, default=None, help="Transaction rows (default 20 per SKU)")
+    parser.add_argument("--categories", type=int, default=len(CATEGORIES), help="Category rows")
+    parser.add_argument("--days", type=int, default=365, help="Days of transaction history")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--today", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+        help="Date the data is generated relative to (default: the current date)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per insert batch")
+    args = parser.parse_args()
+
+    if args.skus < 1 or args.categories < 1 or args.days < 1:
+        print("[error] --skus, --categories and --days must be positive")
+        sys.exit(1)
+    transactions = args.transactions if args.transactions is not None else 20 * args.skus
+
+    use_backend({"DATABASE_URL": database_url(args.database)})
+    run_generate(
+        skus=args.skus,
+        transactions=transactions,
+        categories=args.categories,
+        days=args.days,
+        seed=args.seed,
+        today=args.today or date.today(),
+        chunk_size=args.chunk_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+benchmarks/run.py
+
+Drive the real Flask app with concurrent request scenarios and record the
+results as JSON.
+
+Each scenario (see benchmarks/scenarios.py) starts from a fresh copy of
+the database, runs ``--warmup`` seconds unmeasured, then ``--seconds``
+measured with ``--concurrency`` clients. There are two transports:
+
+* ``client``: every client is a process with its own app instance, driven
+  through Flask's test client. No sockets are involved, so the numbers
+  cover the app and the database only.
+* ``http``: one process serves the app with Werkzeug's threaded WSGI
+  server over keep-alive HTTP, and client processes call it.
+
+For every scenario the run records:
+
+* requests, throughput and failures: 5xx responses or connection errors;
+  4xx responses such as out-of-stock checkouts count as normal outcomes;
+* the status breakdown;
+* mean, p50, p95, p99 and max latency;
+* peak RSS of the processes running the app.
+
+Compare two result files with ``python -m benchmarks.compare``.
+
+Usage:
+    python -m benchmarks.run --database /tmp/bench.db
+    python -m benchmarks.run --database /tmp/bench.db --transport http --concurrency 8 --seconds 20
+    python -m benchmarks.run --database /tmp/bench.db --scenario checkout --env DB_PROFILE=production
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks import REPO_DIR, RESULTS_DIR, database_url, use_backend
+from benchmarks.scenarios import SCENARIOS, load_fixture
+
+# Status recorded for a request that got no HTTP response at all
+CONNECTION_ERROR = 599
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def drive(send, seconds: float, warmup: float, barrier) -> tuple[float, list[tuple[int, float]]]:
+    """Call ``send()`` (returns a status) for ``warmup`` then ``seconds``; time the latter."""
+    barrier.wait()
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        send()
+    # Every client starts measuring together, after every warm-up is done
+    barrier.wait()
+    samples = []
+    began = time.perf_counter()
+    deadline = began + seconds
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            break
+        status = send()
+        samples.append((status, time.perf_counter() - started))
+    return time.perf_counter() - began, samples
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+def client_worker(job: tuple) -> dict:
+    """``client`` transport: this process runs its own app instance."""
+    env, scenario, seconds, warmup, fixture, seed, barrier = job
+    use_backend(env)
+    from flask_jwt_extended import create_access_token
+    from app import app
+
+    with app.app_context():
+        headers = {"Authorization": "Bearer " + create_access_token(identity="bench")}
+    rng = random.Random(seed)
+    build = SCENARIOS[scenario]
+    with app.test_client() as client:
+        def send() -> int:
+            method, path, body = build(rng, fixture)
+            return client.open(path, method=method, json=body, headers=headers).status_code
+
+        wall, samples = drive(send, seconds, warmup, barrier)
+    return {"wall": wall, "samples": samples, "rss": peak_rss_mb()}
+
+
+def http_worker(job: tuple) -> dict:
+    """``http`` transport: one keep-alive connection to the server process."""
+    port, token, scenario, seconds, warmup, fixture, seed, barrier = job
+    headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json"}
+    rng = random.Random(seed)
+    build = SCENARIOS[scenario]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def send() -> int:
+        method, path, body = build(rng, fixture)
+        try:
+            conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            return CONNECTION_ERROR
+
+    wall, samples = drive(send, seconds, warmup, barrier)
+    conn.close()
+    return {"wall": wall, "samples": samples, "rss": None}
+
+
+def serve(env: dict[str, str], queue, stop) -> None:
+    """``http`` transport server process: report (port, token), serve until ``stop``, report RSS."""
+    use_backend(env)
+    from flask_jwt_extended import create_access_token
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import app
+
+    class Handler(WSGIRequestHandler):
+        # HTTP/1.1 keeps client connections open between requests
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args) -> None:
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=Handler)
+    with app.app_context():
+        token = create_access_token(identity="bench")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    queue.put((server.server_port, token))
+    stop.wait()
+    server.shutdown()
+    queue.put(peak_rss_mb())
+
+
+# ---------------------------------------------------------------------------
+# Core runner logic
+# ---------------------------------------------------------------------------
+def copy_database(source_url: str, tmp: str, name: str) -> str:
+    """A private copy of an SQLite database, so each scenario starts from the same data."""
+    if not source_url.startswith("sqlite:///"):
+        return source_url
+    target = os.path.join(tmp, f"{name}.db")
+    # The backup API also copies pages still in a WAL file
+    with sqlite3.connect(source_url[len("sqlite:///"):]) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+    return f"sqlite:///{target}"
+
+
+def run_scenario(scenario: str, args: argparse.Namespace, fixture: dict, env: dict[str, str], tmp: str) -> dict:
+    env = {**env, "DATABASE_URL": copy_database(env["DATABASE_URL"], tmp, scenario)}
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(args.concurrency)
+        seeds = [args.seed * 1000 + i for i in range(args.concurrency)]
+        if args.transport == "client":
+            jobs = [(env, scenario, args.seconds, args.warmup, fixture, s, barrier) for s in seeds]
+            with ctx.Pool(args.concurrency) as pool:
+                results = pool.map(client_worker, jobs)
+            rss = max((r["rss"] for r in results if r["rss"] is not None), default=None)
+        else:
+            queue, stop = ctx.Queue(), ctx.Event()
+            server = ctx.Process(target=serve, args=(env, queue, stop))
+            server.start()
+            port, token = queue.get(timeout=120)
+            jobs = [(port, token, scenario, args.seconds, args.warmup, fixture, s, barrier) for s in seeds]
+            with ctx.Pool(args.concurrency) as pool:
+                results = pool.map(http_worker, jobs)
+            stop.set()
+            rss = queue.get(timeout=60)
+            server.join()
+
+    # Measured from the barrier, so process start-up and warm-up are excluded
+    elapsed = max(r["wall"] for r in results)
+    samples = [s for r in results for s in r["samples"]]
+    statuses = Counter(status for status, _ in samples)
+    latencies = sorted(latency * 1e3 for _, latency in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(n for status, n in statuses.items() if status >= 500),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "throughput": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latencyMs": {
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "peakRssMb": rss,
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def fixture_worker(env: dict[str, str]) -> dict:
+    use_backend(env)
+    return load_fixture()
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, timeout=10, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# ---------------------------------------------------------------------------
+# CLI entrypoint
+# ---------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run load-test scenarios against the backend.")
+    parser.add_argument("--database", required=True, help="SQLite file (copied per scenario) or SQLAlchemy URL")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument("--transport", choices=("client", "http"), default="client", help="How clients reach the app")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measured duration per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured lead-in per scenario")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the request sequence")
+    parser.add_argument(
+        "--today", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+        help="Date forecast requests are relative to (default: the current date)",
+    )
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE",
+        help="Backend config override, e.g. DB_PROFILE=production (repeatable)",
+    )
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<time>-<transport>.json)")
+    args = parser.parse_args()
+
+    if args.concurrency < 1 or args.seconds <= 0 or args.warmup < 0:
+        print("[error] --concurrency and --seconds must be positive, --warmup not negative")
+        sys.exit(1)
+    try:
+        overrides = dict(item.split("=", 1) for item in args.env)
+    except ValueError:
+        print("[error] --env takes KEY=VALUE")
+        sys.exit(1)
+    scenarios = args.scenario or list(SCENARIOS)
+    source_url = database_url(args.database)
+    if not source_url.startswith("sqlite:///"):
+        print("[warn] Not an SQLite file: scenarios share the database, and checkouts change it")
+    # Metrics and Server-Timing stay at the app's defaults unless overridden,
+    # so results match how the app is deployed
+    env = {"FORECAST_WARMUP": "false", **overrides, "DATABASE_URL": source_url}
+
+    started_at = datetime.now(timezone.utc)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="amo-bench-") as tmp:
+        fixture_env = {**env, "DATABASE_URL": copy_database(source_url, tmp, "fixture")}
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            fixture = pool.apply(fixture_worker, (fixture_env,))
+        fixture["today"] = (args.today or date.today()).isoformat()
+        for scenario in scenarios:
+            print(f"[info] {scenario}: {args.concurrency} clients × {args.seconds:g}s ({args.transport})")
+            results[scenario] = run_scenario(scenario, args, fixture, env, tmp)
+
+    report = {
+        "meta": {
+            "createdAt": started_at.isoformat(timespec="seconds"),
+            "gitCommit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "transport": args.transport,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "today": fixture["today"],
+            "env": overrides,
+            "dataset": fixture["dataset"],
+        },
+        "scenarios": results,
+    }
+    output = args.output or str(RESULTS_DIR / f"{started_at:%Y%m%d-%H%M%S}-{args.transport}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+        fh.write("\n")
+
+    # Summary ----------------------------------------------------------------
+    dataset = fixture["dataset"]
+    print("\n" + "=" * 55)
+    print("  BENCHMARK SUMMARY")
+    print("=" * 55)
+    print(f"  Dataset             : {dataset['inventory']:,} SKUs, {dataset['transactions']:,} transactions")
+    print(f"  Clients × seconds   : {args.concurrency} × {args.seconds:g}s ({args.transport})")
+    for scenario, r in results.items():
+        lat = r["latencyMs"]
+        rss = f"{r['peakRssMb']:,.0f} MB" if r["peakRssMb"] is not None else "n/a"
+        print(f"  [{scenario}]")
+        print(f"    Requests / sec    : {r['throughput']:,.1f} ({r['requests']:,} requests, {r['errors']} failed)")
+        print(f"    p50/p95/p99       : {lat['p50']:.1f} / {lat['p95']:.1f} / {lat['p99']:.1f} ms")
+        print(f"    Peak RSS          : {rss}")
+    print(f"  Results             : {output}")
+    print("=" * 55)
+
+
+if __name__ == "__main__":
+    main()
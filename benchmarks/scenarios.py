@@ -0,0 +1,135 @@
+"""
+benchmarks/scenarios.py
+
+The request mixes ``benchmarks.run`` can drive, and the fixture they draw from.
+
+A scenario is a function ``(rng, fixture) -> (method, path, json body or
+None)`` that builds one request. The fixture is read once per run from the
+database under test, with a deterministic sample, so a given ``--seed``
+replays the same request sequence against the same data. Forecast dates
+are relative to ``fixture["today"]``, which ``benchmarks.run --today`` pins.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from datetime import date, timedelta
+from urllib.parse import quote
+
+Request = tuple[str, str, "dict | None"]
+
+# In-stock SKUs, product ids and name words sampled into the fixture
+FIXTURE_SAMPLE = 5000
+
+
+def load_fixture(sample_size: int = FIXTURE_SAMPLE) -> dict:
+    """Sample what the scenarios need; runs with the backend configured."""
+    from app import app
+    from models import db, Category, Inventory, Transaction
+
+    # The app rejects sales of expired items by its own clock, not --today
+    today = date.today()
+    with app.app_context():
+        count = db.session.scalar(db.select(db.func.count(Inventory.id)))
+        # Every n-th row in id order: the same sample on every run
+        stride = max(1, count // sample_size)
+        rows = db.session.execute(
+            db.select(Inventory.id, Inventory.sku_id, Inventory.name)
+            .where(
+                Inventory.status != "deleted",
+                Inventory.quantity > 0,
+                Inventory.sku_id.isnot(None),
+                Inventory.sku_id != "",
+                db.or_(Inventory.expiry.is_(None), Inventory.expiry >= today),
+                Inventory.id % stride == 0,
+            )
+            .order_by(Inventory.id)
+            .limit(sample_size)
+        ).all()
+        model_dir = app.config["MODEL_DIR"]
+        dataset = {
+            "inventory": count,
+            "categories": db.session.scalar(db.select(db.func.count(Category.id))),
+            "transactions": db.session.scalar(db.select(db.func.count(Transaction.id))),
+        }
+
+    words = sorted({w for _, _, name in rows for w in name.split() if w.isalpha() and len(w) > 2})
+    model_skus = sorted(f[:-4] for f in os.listdir(model_dir) if f.endswith(".pkl")) if os.path.isdir(model_dir) else []
+    return {
+        "skus": [sku for _, sku, _ in rows],
+        "product_ids": [row_id for row_id, _, _ in rows],
+        "words": words or ["item"],
+        "model_skus": model_skus or ["SKU0001"],
+        "dataset": dataset,
+    }
+
+
+def skewed(rng: random.Random, values: list):
+    # Most picks land on the first values, like best sellers
+    return values[int(len(values) * rng.random() ** 3)]
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+def checkout(rng: random.Random, fixture: dict) -> Request:
+    if not fixture["skus"]:
+        return "GET", "/healthz/live", None
+    items = [{"sku_id": skewed(rng, fixture["skus"]), "quantity": 1} for _ in range(rng.randint(1, 5))]
+    kind = "purchase" if rng.random() < 0.1 else "sale"
+    return "POST", "/api/transactions/batch", {"transaction_type": kind, "items": items}
+
+
+def search(rng: random.Random, fixture: dict) -> Request:
+    word = rng.choice(fixture["words"])
+    # Whole words, or the first letters of one as a type-ahead would send
+    term = word if rng.random() < 0.7 else word[: rng.randint(3, len(word))]
+    return "GET", f"/api/inventory?search={quote(term)}&limit=50", None
+
+
+def expiry_radar(rng: random.Random, fixture: dict) -> Request:
+    return "GET", f"/api/expiry-radar?days={rng.choice((7, 30, 90))}&limit=50", None
+
+
+def transaction_list(rng: random.Random, fixture: dict) -> Request:
+    if fixture["product_ids"] and rng.random() < 0.5:
+        return "GET", f"/api/transactions?productId={skewed(rng, fixture['product_ids'])}&limit=100", None
+    return "GET", "/api/transactions?limit=100", None
+
+
+def predict(rng: random.Random, fixture: dict) -> Request:
+    day = date.fromisoformat(fixture["today"]) + timedelta(days=rng.randint(1, 90))
+    rain = rng.choice((0, 0, 0, 2.5, 10))
+    holiday = 1 if rng.random() < 0.05 else 0
+    return (
+        "GET",
+        f"/predict?sku_id={rng.choice(fixture['model_skus'])}&date={day.isoformat()}"
+        f"&temp={rng.uniform(10, 35):.1f}&rain={rain}&holiday={holiday}",
+        None,
+    )
+
+
+# Share of each scenario in "mixed", roughly a till-heavy store day
+MIXED_WEIGHTS = {
+    "checkout": 25,
+    "search": 25,
+    "transactions": 20,
+    "expiry": 10,
+    "predict": 20,
+}
+
+
+def mixed(rng: random.Random, fixture: dict) -> Request:
+    name = rng.choices(list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values()))[0]
+    return SCENARIOS[name](rng, fixture)
+
+
+SCENARIOS = {
+    "checkout": checkout,
+    "search": search,
+    "expiry": expiry_radar,
+    "transactions": transaction_list,
+    "predict": predict,
+    "mixed": mixed,
+}